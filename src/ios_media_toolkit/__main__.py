@@ -0,0 +1,25 @@
+"""
+Entry point for `imt` and `python -m ios_media_toolkit`.
+
+`imt --version` is answered here, before the CLI module (and with it typer,
+rich and the command tree) is imported.
+"""
+
+import sys
+
+
+def main() -> None:
+    """Run the CLI, short-circuiting a bare --version request."""
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        from . import __version__
+
+        print(f"imt version {__version__}")
+        return
+
+    from .cli import main_cli
+
+    main_cli()
+
+
+if __name__ == "__main__":
+    main()
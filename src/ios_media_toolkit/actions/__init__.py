@@ -3,25 +3,41 @@ Actions layer - Pure Python functions for media processing.
 
 All functions are CLI-agnostic and return typed results.
 These can be called directly from Python code without going through CLI.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+e.g. scan_folder does not pull in the transcode/verify dependencies.
 """
 
-from .classify import ClassifyResult, classify_favorites, is_favorite
-from .copy import CopyResult, copy_files, copy_photos
-from .scan import ScanResult, scan_folder
-from .transcode import TranscodeResult, transcode_video
-from .verify import VerifyResult, verify_dv_compatibility
-
-__all__ = [
-    "scan_folder",
-    "ScanResult",
-    "classify_favorites",
-    "is_favorite",
-    "ClassifyResult",
-    "transcode_video",
-    "TranscodeResult",
-    "copy_files",
-    "copy_photos",
-    "CopyResult",
-    "verify_dv_compatibility",
-    "VerifyResult",
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "scan_folder": "scan",
+    "ScanResult": "scan",
+    "classify_favorites": "classify",
+    "is_favorite": "classify",
+    "ClassifyResult": "classify",
+    "transcode_video": "transcode",
+    "TranscodeResult": "transcode",
+    "copy_files": "copy",
+    "copy_photos": "copy",
+    "CopyResult": "copy",
+    "verify_dv_compatibility": "verify",
+    "VerifyResult": "verify",
+    "scan_and_classify": "pipeline",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
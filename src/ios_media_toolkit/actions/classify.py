@@ -7,7 +7,7 @@ from ..classifier import classify_album as _classify_album
 from ..classifier import is_favorite as _is_favorite
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClassifyResult:
     """Result of classification operation."""
 
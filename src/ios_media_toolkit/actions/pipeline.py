@@ -0,0 +1,80 @@
+"""Pipeline actions - Fused scan and classify over a single directory listing."""
+
+import os
+from pathlib import Path
+
+from ..classifier import CLASSIFY_EXTENSIONS, classify_with_index
+from ..constants import PHOTO_EXTENSIONS, VIDEO_EXTENSIONS
+from .classify import ClassifyResult
+from .scan import ScanResult
+
+
+def _failed(error: str) -> tuple[ScanResult, ClassifyResult]:
+    """Build the failed result pair for a folder that cannot be scanned."""
+    return (
+        ScanResult(success=False, videos=[], photos=[], error=error),
+        ClassifyResult(success=False, favorites=set(), error=error),
+    )
+
+
+def scan_and_classify(source: Path, rating_threshold: int = 5) -> tuple[ScanResult, ClassifyResult]:
+    """
+    Scan a folder for media and classify favorites in one directory pass.
+
+    Equivalent to scan_folder() followed by classify_favorites(), but the
+    directory is listed once and that listing also supplies the XMP sidecar
+    names, so no per-file existence probes are needed.
+
+    Args:
+        source: Path to folder to scan
+        rating_threshold: Minimum rating to be considered favorite (default 5)
+
+    Returns:
+        Tuple of (ScanResult, ClassifyResult)
+    """
+    if not source.exists():
+        return _failed(f"Folder not found: {source}")
+
+    if not source.is_dir():
+        return _failed(f"Not a directory: {source}")
+
+    videos: list[Path] = []
+    photos: list[Path] = []
+    video_sizes: list[int] = []
+    photo_sizes: list[int] = []
+    to_classify: list[Path] = []
+    xmp_names: set[str] = set()
+
+    with os.scandir(source) as entries:
+        for entry in entries:
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext == ".xmp":
+                xmp_names.add(entry.name)
+                continue
+            if not entry.is_file():
+                continue
+            if ext in VIDEO_EXTENSIONS:
+                path = Path(entry.path)
+                videos.append(path)
+                video_sizes.append(entry.stat().st_size)
+            elif ext in PHOTO_EXTENSIONS:
+                path = Path(entry.path)
+                photos.append(path)
+                photo_sizes.append(entry.stat().st_size)
+            else:
+                continue
+            if ext in CLASSIFY_EXTENSIONS:
+                to_classify.append(path)
+
+    scan_result = ScanResult(
+        success=True, videos=videos, photos=photos, video_sizes=video_sizes, photo_sizes=photo_sizes
+    )
+
+    try:
+        classifications = classify_with_index(to_classify, xmp_names, rating_threshold)
+    except Exception as e:
+        return scan_result, ClassifyResult(success=False, favorites=set(), error=str(e))
+
+    favorites = {p.stem for p, info in classifications.items() if info.is_favorite}
+    classify_result = ClassifyResult(success=True, favorites=favorites, total_classified=len(classifications))
+    return scan_result, classify_result
@@ -1,12 +1,14 @@
 """Scan actions - File discovery and folder scanning."""
 
+import os
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
 
 from ..constants import MOV_EXTENSIONS, PHOTO_EXTENSIONS, VIDEO_EXTENSIONS
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScanResult:
     """Result of a scan operation."""
 
@@ -14,6 +16,9 @@ class ScanResult:
     videos: list[Path]
     photos: list[Path]
     error: str | None = None
+    # File sizes captured during the scan, parallel to videos/photos (None if not collected)
+    video_sizes: list[int] | None = None
+    photo_sizes: list[int] | None = None
 
     @property
     def total_files(self) -> int:
@@ -21,7 +26,13 @@ class ScanResult:
 
     @property
     def total_size_bytes(self) -> int:
-        return sum(f.stat().st_size for f in self.videos + self.photos if f.exists())
+        if self.video_sizes is not None and self.photo_sizes is not None:
+            return sum(self.video_sizes) + sum(self.photo_sizes)
+        total = 0
+        for f in chain(self.videos, self.photos):
+            if f.exists():
+                total += f.stat().st_size
+        return total
 
 
 def scan_folder(source: Path) -> ScanResult:
@@ -40,12 +51,28 @@ def scan_folder(source: Path) -> ScanResult:
     if not source.is_dir():
         return ScanResult(success=False, videos=[], photos=[], error=f"Not a directory: {source}")
 
-    videos = [f for f in source.iterdir() if f.is_file() and f.suffix in VIDEO_EXTENSIONS]
-    photos = [f for f in source.iterdir() if f.is_file() and f.suffix in PHOTO_EXTENSIONS]
+    videos: list[Path] = []
+    photos: list[Path] = []
+    video_sizes: list[int] = []
+    photo_sizes: list[int] = []
 
-    return ScanResult(success=True, videos=videos, photos=photos)
+    # Single pass; DirEntry.is_file() reuses the type from readdir instead of a stat per file
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in VIDEO_EXTENSIONS:
+                videos.append(Path(entry.path))
+                video_sizes.append(entry.stat().st_size)
+            elif ext in PHOTO_EXTENSIONS:
+                photos.append(Path(entry.path))
+                photo_sizes.append(entry.stat().st_size)
+
+    return ScanResult(success=True, videos=videos, photos=photos, video_sizes=video_sizes, photo_sizes=photo_sizes)
 
 
 def is_mov_file(path: Path) -> bool:
     """Check if a file is a MOV file (iPhone raw video)."""
-    return path.suffix in MOV_EXTENSIONS
+    # splitext works on the cached path string instead of re-parsing it like Path.suffix
+    return os.path.splitext(path)[1].lower() in MOV_EXTENSIONS
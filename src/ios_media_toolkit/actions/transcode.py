@@ -8,7 +8,7 @@ if TYPE_CHECKING:
     from ..profiles import EncodingProfile
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TranscodeResult:
     """Result of a transcode operation."""
 
@@ -6,7 +6,7 @@ from pathlib import Path
 from ..verifier import verify_file
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VerifyResult:
     """Result of verification action."""
 
@@ -4,12 +4,15 @@ Classifier module - Favorites detection from XMP metadata
 Parses XMP sidecar files to identify favorites (Rating=5).
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FavoriteInfo:
     """Information about a file's favorite status."""
 
@@ -19,13 +22,44 @@ class FavoriteInfo:
     xmp_path: Path | None = None
 
 
-# Patterns to match rating in XMP files
-RATING_PATTERNS = [
-    (re.compile(r"<xmp:Rating>(\d+)</xmp:Rating>"), "xmp"),
-    (re.compile(r"<exif:Rating>(\d+)</exif:Rating>"), "exif"),
-    (re.compile(r'xmp:Rating="(\d+)"'), "xmp"),
-    (re.compile(r'exif:Rating="(\d+)"'), "exif"),
-]
+# Single alternation matching rating in XMP files (one scan instead of one per form)
+_RATING_PATTERN = (
+    r"<xmp:Rating>(\d+)</xmp:Rating>"
+    r"|<exif:Rating>(\d+)</exif:Rating>"
+    r'|xmp:Rating="(\d+)"'
+    r'|exif:Rating="(\d+)"'
+)
+_RATING_RE = re.compile(_RATING_PATTERN)
+
+# Same pattern over raw bytes, so sidecars can be searched without decoding
+_RATING_RE_BYTES = re.compile(_RATING_PATTERN.encode("ascii"))
+
+# Literal shared by every rating form; a fast substring find rejects unrated sidecars
+# and lets the regex start just before the first candidate ("<exif:" is the longest prefix)
+_RATING_LITERAL = b"Rating"
+_RATING_PREFIX_MAX = len(b"<exif:")
+
+# Rating tags sit in the XMP header; no need to look past the first 64 KiB
+XMP_SEARCH_WINDOW = 64 * 1024
+
+# Rating source for each capture group of _RATING_RE
+_GROUP_TO_SOURCE = ("xmp", "exif", "xmp", "exif")
+
+# Media extensions checked for sidecars (lowercase)
+CLASSIFY_EXTENSIONS = frozenset({".heic", ".jpg", ".jpeg", ".png", ".mov", ".mp4", ".m4v"})
+
+# Sidecar reads are blocking I/O, so threads overlap them despite the GIL
+CLASSIFY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Fewer sidecar reads than this are done inline; starting a pool would cost more than it overlaps
+CLASSIFY_PARALLEL_MIN = 8
+
+
+def _sidecar_names(media_path: Path) -> tuple[str, str, str]:
+    """Candidate XMP sidecar names for a media file, in lookup order."""
+    name = media_path.name
+    # photo.HEIC.xmp, photo.HEIC.XMP, then stem only: photo.xmp
+    return f"{name}.xmp", f"{name}.XMP", f"{media_path.stem}.xmp"
 
 
 def find_xmp_sidecar(media_path: Path) -> Path | None:
@@ -37,20 +71,19 @@ def find_xmp_sidecar(media_path: Path) -> Path | None:
     - photo.xmp
     - photo.HEIC.XMP (case insensitive)
     """
-    # Try exact match first: photo.HEIC.xmp
-    xmp_path = media_path.parent / f"{media_path.name}.xmp"
-    if xmp_path.exists():
-        return xmp_path
+    for sidecar_name in _sidecar_names(media_path):
+        xmp_path = media_path.parent / sidecar_name
+        if xmp_path.exists():
+            return xmp_path
+
+    return None
 
-    # Try uppercase: photo.HEIC.XMP
-    xmp_path_upper = media_path.parent / f"{media_path.name}.XMP"
-    if xmp_path_upper.exists():
-        return xmp_path_upper
 
-    # Try stem only: photo.xmp (for photo.HEIC)
-    xmp_stem = media_path.parent / f"{media_path.stem}.xmp"
-    if xmp_stem.exists():
-        return xmp_stem
+def _find_xmp_sidecar_in(media_path: Path, xmp_names: set[str]) -> Path | None:
+    """Like find_xmp_sidecar, but probes a pre-built set of sidecar names in the directory."""
+    for sidecar_name in _sidecar_names(media_path):
+        if sidecar_name in xmp_names:
+            return media_path.parent / sidecar_name
 
     return None
 
@@ -62,41 +95,73 @@ def parse_rating(xmp_content: str) -> tuple[int, str]:
     Returns:
         Tuple of (rating, source) where source is 'xmp', 'exif', or 'none'
     """
-    for pattern, source in RATING_PATTERNS:
-        match = pattern.search(xmp_content)
-        if match:
-            rating = int(match.group(1))
-            return rating, source
+    match = _RATING_RE.search(xmp_content)
+    if match:
+        idx = match.lastindex
+        return int(match.group(idx)), _GROUP_TO_SOURCE[idx - 1]
 
     return 0, "none"
 
 
-def is_favorite(media_path: Path, rating_threshold: int = 5) -> FavoriteInfo:
+def _read_xmp_rating(xmp_path: Path) -> tuple[int, str]:
     """
-    Check if a media file is marked as favorite.
+    Read the rating from an XMP sidecar without decoding it.
 
-    Args:
-        media_path: Path to the media file (HEIC, JPG, MOV, etc.)
-        rating_threshold: Minimum rating to be considered favorite (default: 5)
+    Reads at most XMP_SEARCH_WINDOW bytes in one call and searches them as bytes.
+    Sidecars are usually a few KB, where a single read is cheaper than mapping.
 
     Returns:
-        FavoriteInfo with favorite status and metadata
+        Tuple of (rating, source) where source is 'xmp', 'exif', or 'none'
     """
-    xmp_path = find_xmp_sidecar(media_path)
+    with open(xmp_path, "rb", buffering=0) as f:
+        head = f.read(XMP_SEARCH_WINDOW)
+
+    pos = head.find(_RATING_LITERAL)
+    if pos == -1:
+        return 0, "none"
+
+    match = _RATING_RE_BYTES.search(head, max(0, pos - _RATING_PREFIX_MAX))
+    if match:
+        idx = match.lastindex
+        return int(match.group(idx)), _GROUP_TO_SOURCE[idx - 1]
+
+    return 0, "none"
+
+
+@lru_cache(maxsize=8192)
+def _cached_xmp_rating(path_str: str, mtime_ns: int, size: int) -> tuple[int, str]:
+    """Memoized _read_xmp_rating; mtime and size in the key invalidate edited sidecars."""
+    return _read_xmp_rating(Path(path_str))
 
+
+def _favorite_info(xmp_path: Path | None, rating_threshold: int) -> FavoriteInfo:
+    """Build FavoriteInfo from an already-located sidecar (or None)."""
     if xmp_path is None:
         return FavoriteInfo(is_favorite=False, rating=0, source="none", xmp_path=None)
 
     try:
-        content = xmp_path.read_text(encoding="utf-8")
-    except (OSError, UnicodeDecodeError):
+        st = xmp_path.stat()
+        rating, source = _cached_xmp_rating(str(xmp_path), st.st_mtime_ns, st.st_size)
+    except OSError:
         return FavoriteInfo(is_favorite=False, rating=0, source="none", xmp_path=xmp_path)
 
-    rating, source = parse_rating(content)
-
     return FavoriteInfo(is_favorite=rating >= rating_threshold, rating=rating, source=source, xmp_path=xmp_path)
 
 
+def is_favorite(media_path: Path, rating_threshold: int = 5) -> FavoriteInfo:
+    """
+    Check if a media file is marked as favorite.
+
+    Args:
+        media_path: Path to the media file (HEIC, JPG, MOV, etc.)
+        rating_threshold: Minimum rating to be considered favorite (default: 5)
+
+    Returns:
+        FavoriteInfo with favorite status and metadata
+    """
+    return _favorite_info(find_xmp_sidecar(media_path), rating_threshold)
+
+
 def classify_album(album_path: Path, rating_threshold: int = 5) -> dict[Path, FavoriteInfo]:
     """
     Classify all media files in an album.
@@ -108,16 +173,53 @@ def classify_album(album_path: Path, rating_threshold: int = 5) -> dict[Path, Fa
     Returns:
         Dict mapping media paths to their FavoriteInfo
     """
-    results: dict[Path, FavoriteInfo] = {}
+    # One directory listing serves both media discovery and sidecar lookup,
+    # replacing up to three exists() probes per media file
+    xmp_names: set[str] = set()
+    candidates: list[Path] = []
+    with os.scandir(album_path) as entries:
+        for entry in entries:
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext == ".xmp":
+                xmp_names.add(entry.name)
+            elif ext in CLASSIFY_EXTENSIONS and entry.is_file():
+                candidates.append(Path(entry.path))
+
+    return classify_with_index(candidates, xmp_names, rating_threshold)
+
+
+def classify_with_index(
+    media_paths: list[Path], xmp_names: set[str], rating_threshold: int = 5
+) -> dict[Path, FavoriteInfo]:
+    """
+    Classify media files whose directory has already been listed.
+
+    Args:
+        media_paths: Media files to classify (all in the same directory)
+        xmp_names: Names of the XMP sidecars in that directory
+        rating_threshold: Minimum rating for favorites
+
+    Returns:
+        Dict mapping media paths to their FavoriteInfo
+    """
+    # Sidecar lookups only probe the name set; just the files that have one need a read
+    sidecars = {path: _find_xmp_sidecar_in(path, xmp_names) for path in media_paths}
+    to_read = [path for path, xmp_path in sidecars.items() if xmp_path is not None]
+
+    # Small albums, or albums exported without sidecars, skip the pool entirely
+    if len(to_read) < CLASSIFY_PARALLEL_MIN:
+        return {path: _favorite_info(xmp_path, rating_threshold) for path, xmp_path in sidecars.items()}
 
-    # Media extensions to check
-    media_extensions = {".heic", ".jpg", ".jpeg", ".png", ".mov", ".mp4", ".m4v"}
+    def classify(media_path: Path) -> FavoriteInfo:
+        return _favorite_info(sidecars[media_path], rating_threshold)
 
-    for file_path in album_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in media_extensions:
-            results[file_path] = is_favorite(file_path, rating_threshold)
+    with ThreadPoolExecutor(max_workers=min(CLASSIFY_WORKERS, len(to_read))) as executor:
+        read = dict(zip(to_read, executor.map(classify, to_read), strict=True))
 
-    return results
+    return {
+        path: read[path] if xmp_path is not None else _favorite_info(None, rating_threshold)
+        for path, xmp_path in sidecars.items()
+    }
 
 
 def get_favorites(album_path: Path, rating_threshold: int = 5) -> list[Path]:
@@ -4,25 +4,27 @@ CLI module - Command line interface for iOS Media Toolkit
 Entry point for the `imt` command using Typer.
 """
 
+import os
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Annotated
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Annotated
 
 import typer
 from rich.console import Console
-from rich.progress import SpinnerColumn, TextColumn  # noqa: F401 - may be used later
-from rich.table import Table
+from rich.text import Text
 
 from . import __version__
-from .classifier import get_favorites
-from .config import AppConfig, load_config
 from .constants import DNG_EXTENSIONS, MOV_EXTENSIONS
-from .encoder import PipelineResult, run_pipeline
-from .profiles import load_profiles_from_yaml
-from .runners import RunnerCallbacks, SequentialRunner
-from .scanner import AlbumScanner
-from .setup_tools import check_tools_status, run_setup
-from .verifier import CheckStatus, verify_file
-from .workflow import create_archive_workflow
+
+# Command dependencies are imported inside each command so that --help,
+# --version and unrelated subcommands don't pay for the whole module graph
+if TYPE_CHECKING:
+    from .config import AppConfig
+    from .encoder import EncoderProfile, PipelineResult
 
 console = Console()
 app = typer.Typer(
@@ -49,6 +51,8 @@ ConfigOption = Annotated[
 
 def get_config(config_path: Path | None = None, album: str | None = None) -> AppConfig:
     """Load configuration with optional album override."""
+    from .config import load_config
+
     return load_config(config_path, album)
 
 
@@ -62,26 +66,78 @@ def main(
     pass
 
 
+_MB = 1024 * 1024
+
+# Shared markers for per-file status lines
+_FAV_MARK = " ★"
+_OK = "[green]✓[/green]"
+_FAIL = "[red]✗[/red]"
+
+
+def _mb(size_bytes: int) -> float:
+    """Convert a byte count to MiB for display."""
+    return size_bytes / _MB
+
+
 def format_size_change(compression_ratio: float) -> str:
     """Format compression ratio as human-readable string."""
-    pct = abs(compression_ratio * 100)
-    if compression_ratio > 0:
-        return f"[green]{pct:.0f}% smaller[/green]"
-    elif compression_ratio < 0:
-        return f"[yellow]{pct:.0f}% larger[/yellow]"
-    else:
+    if not compression_ratio:
         return "same size"
+    pct = round(compression_ratio * 100)
+    if compression_ratio > 0:
+        return f"[green]{pct}% smaller[/green]"
+    return f"[yellow]{-pct}% larger[/yellow]"
+
+
+# Shared stand-in for a missing config file
+_EMPTY_CONFIG: Mapping = MappingProxyType({})
+
+# Repository config used when --config is not given
+_DEFAULT_CFG = Path(__file__).parent.parent.parent / "config" / "global.yaml"
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml_config(path_str: str, mtime_ns: int, size: int) -> Mapping:
+    """
+    Parse a YAML config file; cached per (path, mtime, size) so edits are picked up.
+
+    load_yaml_data keeps the parsed result in the XDG cache dir across
+    invocations, so YAML is only parsed after the file changes.
+    """
+    from .config import load_yaml_data
+
+    return MappingProxyType(load_yaml_data(Path(path_str)))
+
+
+def _config_file_key(config_path: Path | None) -> tuple[str, int, int] | None:
+    """(resolved path, mtime_ns, size) of the config file, or None if it is missing."""
+    config_file = config_path or _DEFAULT_CFG
+    try:
+        st = config_file.stat()
+    except OSError:
+        return None
+    return str(config_file.resolve()), st.st_mtime_ns, st.st_size
+
+
+def _load_yaml_config(config_path: Path | None = None) -> Mapping:
+    """
+    Load YAML config file (read-only view, shared between calls).
+
+    A missing file returns before yaml is imported or anything is parsed.
+    """
+    key = _config_file_key(config_path)
+    return _parse_yaml_config(*key) if key else _EMPTY_CONFIG
 
 
-def _load_yaml_config(config_path: Path | None = None) -> dict:
-    """Load YAML config file."""
-    import yaml
+@lru_cache(maxsize=16)
+def _build_config_profiles(loader: Callable[[Mapping], dict], key: tuple[str, int, int] | None) -> Mapping:
+    """Build profiles with loader from the config file identified by key (None = no config)."""
+    return MappingProxyType(loader(_parse_yaml_config(*key) if key else _EMPTY_CONFIG))
 
-    config_file = config_path or Path(__file__).parent.parent.parent / "config" / "global.yaml"
-    if config_file.exists():
-        with open(config_file) as f:
-            return yaml.safe_load(f) or {}
-    return {}
+
+def _load_config_profiles(config_path: Path | None, loader: Callable[[Mapping], dict]) -> Mapping:
+    """Build profiles from the config file with loader, reusing them until the file changes."""
+    return _build_config_profiles(loader, _config_file_key(config_path))
 
 
 @app.command()
@@ -112,6 +168,12 @@ def process(
 
         imt process ./media -o ./encoded --dry-run
     """
+    from .actions import scan_and_classify
+    from .dng import load_dng_profiles
+    from .profiles import load_profiles_from_yaml
+    from .runners import RunnerCallbacks, SequentialRunner
+    from .workflow import create_archive_workflow
+
     # Determine output directory
     if output is None:
         output = source.parent / f"{source.name}_processed"
@@ -119,7 +181,7 @@ def process(
 
     # Load configuration
     yaml_cfg = _load_yaml_config(config)
-    profiles = load_profiles_from_yaml(yaml_cfg)
+    profiles = _load_config_profiles(config, load_profiles_from_yaml)
 
     # Use default profile from config if not specified
     if profile is None:
@@ -140,17 +202,21 @@ def process(
         raise typer.Exit(1)
 
     # Load DNG profile if specified
-    from .dng import load_dng_profiles
-
     dng_profile_cfg = None
     if dng_profile:
-        dng_profiles = load_dng_profiles(yaml_cfg)
+        dng_profiles = _load_config_profiles(config, load_dng_profiles)
         if dng_profile not in dng_profiles:
             console.print(f"[red]Error:[/red] Unknown DNG profile: {dng_profile}")
             console.print(f"Available: {', '.join(dng_profiles.keys())}")
             raise typer.Exit(1)
         dng_profile_cfg = dng_profiles[dng_profile]
 
+    # Scan and classify once; the dry run reports from these and the runner reuses them
+    with console.status("Scanning..."):
+        scan_result, classify_result = scan_and_classify(source)
+    # Immutable stem set shared by the dry-run listing and the progress callbacks
+    favorites = frozenset(classify_result.favorites)
+
     # Create workflow
     workflow = create_archive_workflow(
         source=source,
@@ -161,10 +227,11 @@ def process(
         force=force,
         limit=limit,
         min_size_mb=min_size,
+        scan_result=scan_result,
+        classify_result=classify_result,
     )
 
     # Setup callbacks for progress display
-    favorites: set[str] = set()
 
     def on_scan_complete(videos: int, photos: int, mov_count: int):
         console.print(f"\n[bold]Processing:[/bold] {source.name}")
@@ -178,35 +245,34 @@ def process(
         console.print()
 
     def on_transcode_start(path: Path, idx: int, total: int):
-        fav = " ★" if path.stem in favorites else ""
+        fav = _FAV_MARK if path.stem in favorites else ""
         console.print(f"  [{idx}/{total}] Transcoding: {path.name}{fav}...")
 
     def on_transcode_complete(path: Path, in_size: int, out_size: int, success: bool):
-        nonlocal favorites
         if success:
-            in_mb = in_size / (1024 * 1024)
-            out_mb = out_size / (1024 * 1024)
+            in_mb = _mb(in_size)
+            out_mb = _mb(out_size)
             ratio = 1.0 - (out_size / in_size) if in_size > 0 else 0
             size_change = format_size_change(ratio)
-            fav = " ★" if path.stem in favorites else ""
-            console.print(f"  [green]✓[/green] {path.name}{fav} {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change})")
+            fav = _FAV_MARK if path.stem in favorites else ""
+            console.print(f"  {_OK} {path.name}{fav} {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change})")
         else:
-            console.print(f"  [red]✗[/red] {path.name}")
+            console.print(f"  {_FAIL} {path.name}")
 
     def on_dng_start(path: Path, idx: int, total: int):
-        fav = " ★" if path.stem in favorites else ""
+        fav = _FAV_MARK if path.stem in favorites else ""
         console.print(f"  [{idx}/{total}] Processing: {path.name}{fav}...")
 
     def on_dng_complete(path: Path, in_size: int, out_size: int, success: bool):
         if success:
-            in_mb = in_size / (1024 * 1024)
-            out_mb = out_size / (1024 * 1024)
+            in_mb = _mb(in_size)
+            out_mb = _mb(out_size)
             ratio = 1.0 - (out_size / in_size) if in_size > 0 else 0
             size_change = format_size_change(ratio)
-            fav = " ★" if path.stem in favorites else ""
-            console.print(f"  [green]✓[/green] {path.name}{fav} {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change})")
+            fav = _FAV_MARK if path.stem in favorites else ""
+            console.print(f"  {_OK} {path.name}{fav} {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change})")
         else:
-            console.print(f"  [red]✗[/red] {path.name}")
+            console.print(f"  {_FAIL} {path.name}")
 
     def on_copy_start(file_type: str, count: int):
         if count > 0:
@@ -218,7 +284,7 @@ def process(
 
     def on_copy_complete(file_type: str, count: int):
         if count > 0:
-            console.print(f"  [green]✓[/green] {count} {file_type} copied")
+            console.print(f"  {_OK} {count} {file_type} copied")
 
     callbacks = RunnerCallbacks(
         on_scan_complete=on_scan_complete,
@@ -233,93 +299,101 @@ def process(
 
     # Dry run: just scan and report
     if dry_run:
-        from .actions import classify_favorites as classify_action
-        from .actions import scan_folder
-
-        scan_result = scan_folder(source)
-        classify_result = classify_action(source)
-        favorites = classify_result.favorites
+        min_size_bytes = min_size * _MB
 
-        min_size_bytes = min_size * 1024 * 1024
-
-        console.print(f"\n[bold]Dry Run:[/bold] {source.name}")
-        console.print(f"  Video:    {profile} - {profile_cfg.description}")
+        header = [f"\n[bold]Dry Run:[/bold] {source.name}", f"  Video:    {profile} - {profile_cfg.description}"]
         if dng_profile_cfg:
-            console.print(f"  DNG:      {dng_profile} - {dng_profile_cfg.description}")
-        console.print()
+            header.append(f"  DNG:      {dng_profile} - {dng_profile_cfg.description}")
+        console.print("\n".join(header), end="\n\n")
 
         to_transcode = 0
         to_copy = 0
         skipped = 0
-
-        for video in scan_result.videos:
-            output_file = output / f"{video.stem}.mp4"
-            is_mov = video.suffix in MOV_EXTENSIONS
-
-            if output_file.exists() and not force:
+        # Per-file lines are collected and printed once after the loops. They are
+        # prebuilt Text, so Rich skips markup parsing and file names print verbatim.
+        lines: list[Text] = []
+
+        # One listing of the output folder instead of an exists() stat per video
+        existing: set[str] = set()
+        if not force and output.is_dir():
+            with os.scandir(output) as entries:
+                existing = {e.name for e in entries if e.is_file()}
+
+        # Sizes were read from the directory listing during the scan; no stat per file here
+        video_sizes = scan_result.video_sizes or [v.stat().st_size for v in scan_result.videos]
+        photo_sizes = scan_result.photo_sizes or [p.stat().st_size for p in scan_result.photos]
+
+        for video, size in zip(scan_result.videos, video_sizes, strict=True):
+            # Path.name/stem/suffix re-derive from the path string on every access
+            name = video.name
+            stem = video.stem
+            is_mov = os.path.splitext(name)[1].lower() in MOV_EXTENSIONS
+
+            if f"{stem}.mp4" in existing:
                 skipped += 1
-                console.print(f"  [dim]SKIP (exists):[/dim] {video.name}")
-            elif not is_mov:
+                lines.append(Text.assemble(("  SKIP (exists):", "dim"), f" {name}"))
+                continue
+            if not is_mov:
                 to_copy += 1
-                size_mb = video.stat().st_size / (1024 * 1024)
-                console.print(f"  [dim]COPY (not MOV):[/dim] {video.name} ({size_mb:.1f}MB)")
-            elif min_size_bytes > 0 and video.stat().st_size < min_size_bytes:
+                size_mb = _mb(size)
+                lines.append(Text.assemble(("  COPY (not MOV):", "dim"), f" {name} ({size_mb:.1f}MB)"))
+            elif min_size_bytes > 0 and size < min_size_bytes:
                 to_copy += 1
-                size_mb = video.stat().st_size / (1024 * 1024)
-                console.print(f"  [dim]COPY (<{min_size}MB):[/dim] {video.name} ({size_mb:.1f}MB)")
+                size_mb = _mb(size)
+                lines.append(Text.assemble((f"  COPY (<{min_size}MB):", "dim"), f" {name} ({size_mb:.1f}MB)"))
             else:
                 to_transcode += 1
-                fav_marker = " [yellow]★[/yellow]" if video.stem in favorites else ""
-                console.print(f"  [cyan]TRANSCODE:[/cyan] {video.name}{fav_marker}")
+                fav_marker = (_FAV_MARK, "yellow") if stem in favorites else ""
+                lines.append(Text.assemble(("  TRANSCODE:", "cyan"), f" {name}", fav_marker))
 
         if limit > 0 and to_transcode > limit:
-            console.print(f"  [dim]Would limit to {limit} of {to_transcode} videos[/dim]")
+            lines.append(Text(f"  Would limit to {limit} of {to_transcode} videos", style="dim"))
 
-        # Separate DNGs from regular photos
-        dngs = [p for p in scan_result.photos if p.suffix in DNG_EXTENSIONS]
-        regular_photos = [p for p in scan_result.photos if p.suffix not in DNG_EXTENSIONS]
-        photos_favorites = sum(1 for p in scan_result.photos if p.stem in favorites)
+        # Separate DNGs from regular photos in one pass
+        dngs: list[tuple[Path, int]] = []
+        regular_photos: list[tuple[Path, int]] = []
+        for photo, size in zip(scan_result.photos, photo_sizes, strict=True):
+            target = dngs if os.path.splitext(photo)[1].lower() in DNG_EXTENSIONS else regular_photos
+            target.append((photo, size))
+        favorites_total = sum(1 for p in chain(scan_result.photos, scan_result.videos) if p.stem in favorites)
 
         # List each photo
-        for photo in regular_photos:
-            size_mb = photo.stat().st_size / (1024 * 1024)
-            fav_marker = " [yellow]★[/yellow]" if photo.stem in favorites else ""
-            console.print(f"  [blue]COPY:[/blue] {photo.name} ({size_mb:.1f}MB){fav_marker}")
+        for photo, size in regular_photos:
+            size_mb = _mb(size)
+            fav_marker = (_FAV_MARK, "yellow") if photo.stem in favorites else ""
+            lines.append(Text.assemble(("  COPY:", "blue"), f" {photo.name} ({size_mb:.1f}MB)", fav_marker))
 
         # List each DNG
         if dng_profile_cfg:
-            for dng in dngs:
-                size_mb = dng.stat().st_size / (1024 * 1024)
-                fav_marker = " [yellow]★[/yellow]" if dng.stem in favorites else ""
-                console.print(f"  [magenta]PROCESS:[/magenta] {dng.name} ({size_mb:.1f}MB){fav_marker}")
-
-        # Summary
-        console.print("\n[bold]Summary:[/bold]")
-        console.print(f"  Videos to transcode: {to_transcode}")
-        console.print(f"  Videos to copy:      {to_copy}")
-        console.print(f"  Photos to copy:      {len(regular_photos)}")
+            for dng, size in dngs:
+                size_mb = _mb(size)
+                fav_marker = (_FAV_MARK, "yellow") if dng.stem in favorites else ""
+                lines.append(Text.assemble(("  PROCESS:", "magenta"), f" {dng.name} ({size_mb:.1f}MB)", fav_marker))
+
+        if lines:
+            console.print(Text("\n").join(lines))
+
+        # Summary, rendered in one print like the listing above
+        summary = [
+            "\n[bold]Summary:[/bold]",
+            f"  Videos to transcode: {to_transcode}",
+            f"  Videos to copy:      {to_copy}",
+            f"  Photos to copy:      {len(regular_photos)}",
+        ]
         if dng_profile_cfg:
-            console.print(f"  DNGs to process:     {len(dngs)}")
-        if photos_favorites > 0:
-            console.print(
-                f"  Favorites detected:  {photos_favorites + sum(1 for v in scan_result.videos if v.stem in favorites)}"
-            )
+            summary.append(f"  DNGs to process:     {len(dngs)}")
+        if favorites_total > 0:
+            summary.append(f"  Favorites detected:  {favorites_total}")
 
         if skipped > 0:
-            console.print(f"\n[yellow]Would skip {skipped} files (already exist). Use --force to redo.[/yellow]")
-        console.print("\n[dim]Dry run - no files processed. Remove --dry-run to execute.[/dim]")
+            summary.append(f"\n[yellow]Would skip {skipped} files (already exist). Use --force to redo.[/yellow]")
+        summary.append("\n[dim]Dry run - no files processed. Remove --dry-run to execute.[/dim]")
+        console.print("\n".join(summary))
         return
 
     # Run the workflow
     runner = SequentialRunner(dry_run=dry_run)
 
-    # Capture favorites for display
-    with console.status("Scanning..."):
-        from .actions import classify_favorites as classify_action
-
-        classify_result = classify_action(source)
-        favorites = classify_result.favorites
-
     # Run the workflow (callbacks will print progress)
     result = runner.run(workflow, callbacks)
 
@@ -345,6 +419,8 @@ def favorites(
     config: ConfigOption = None,
 ):
     """List favorite files in a folder (based on XMP ratings)."""
+    from .classifier import get_favorites
+
     cfg = get_config(config)
 
     favs = get_favorites(source, cfg.favorites.rating_threshold)
@@ -364,6 +440,10 @@ def status(
     source: Annotated[Path, typer.Argument(help="Folder to check status", exists=True, file_okay=False)],
 ):
     """Show folder contents summary."""
+    from rich.table import Table
+
+    from .scanner import AlbumScanner
+
     # Scan source
     scanner = AlbumScanner()
     album_data = scanner.scan(source)
@@ -374,10 +454,19 @@ def status(
     table.add_column("Metric", style="cyan")
     table.add_column("Value", style="green")
 
+    # Count in one pass instead of building the photos/videos lists just for len()
+    photo_count = 0
+    video_count = 0
+    for media_file in album_data.files:
+        if media_file.file_type.is_photo:
+            photo_count += 1
+        elif media_file.file_type.is_video:
+            video_count += 1
+
     table.add_row("Path", str(source))
     table.add_row("Total Files", str(len(album_data.files)))
-    table.add_row("Photos", str(len(album_data.photos)))
-    table.add_row("Videos", str(len(album_data.videos)))
+    table.add_row("Photos", str(photo_count))
+    table.add_row("Videos", str(video_count))
 
     console.print(table)
 
@@ -385,6 +474,10 @@ def status(
 @app.command()
 def check():
     """Check system dependencies and show their locations."""
+    from rich.table import Table
+
+    from .setup_tools import check_tools_status
+
     tools = check_tools_status()
 
     table = Table(title="System Dependencies")
@@ -411,29 +504,47 @@ def check():
             console.print("Install DV tools: imt setup")
 
 
+def _folder_summary(folder: Path) -> tuple[int, int]:
+    """Count the regular files directly in folder and their total size."""
+    file_count = 0
+    size = 0
+    # One walk; DirEntry.is_file() uses the readdir type, so only files get a stat
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file():
+                file_count += 1
+                size += entry.stat().st_size
+    return file_count, size
+
+
 @app.command()
 def scan(
     source: Annotated[Path, typer.Argument(help="Folder to scan", exists=True, file_okay=False)],
 ):
     """List subfolders in a directory with file counts."""
-    album_dirs = [d for d in source.iterdir() if d.is_dir() and not d.name.startswith(".")]
+    # DirEntry.is_dir() uses the type from readdir, so subfolders are found without a stat each
+    with os.scandir(source) as entries:
+        album_dirs = [Path(e.path) for e in entries if not e.name.startswith(".") and e.is_dir()]
 
     if not album_dirs:
         console.print("No subfolders found")
         return
 
+    from rich.table import Table
+
     table = Table(title=f"Subfolders in {source.name}")
     table.add_column("Folder", style="cyan")
     table.add_column("Files", justify="right")
     table.add_column("Size", justify="right")
 
-    for album_dir in sorted(album_dirs):
-        files = list(album_dir.iterdir())
-        file_count = len([f for f in files if f.is_file()])
-        size = sum(f.stat().st_size for f in files if f.is_file())
-        size_str = f"{size / (1024 * 1024):.1f} MB"
+    # Folder summaries are stat-bound; threads overlap the syscalls across folders
+    album_dirs = sorted(album_dirs)
+    with ThreadPoolExecutor(max_workers=min(32, len(album_dirs))) as executor:
+        summaries = executor.map(_folder_summary, album_dirs)
 
-        table.add_row(album_dir.name, str(file_count), size_str)
+        for album_dir, (file_count, size) in zip(album_dirs, summaries, strict=True):
+            size_str = f"{_mb(size):.1f} MB"
+            table.add_row(album_dir.name, str(file_count), size_str)
 
     console.print(table)
 
@@ -457,6 +568,9 @@ def transcode_cmd(
 
         imt transcode video.MOV -p nvenc_1080p --overwrite
     """
+    from .encoder import run_pipeline
+    from .profiles import load_profiles_from_yaml
+
     # Determine output directory
     output_dir = output or video.parent
 
@@ -468,8 +582,7 @@ def transcode_cmd(
         raise typer.Exit(1)
 
     # Load profile
-    yaml_cfg = _load_yaml_config(config)
-    profiles = load_profiles_from_yaml(yaml_cfg)
+    profiles = _load_config_profiles(config, load_profiles_from_yaml)
 
     if profile not in profiles:
         console.print(f"[red]Error:[/red] Unknown profile: {profile}")
@@ -487,15 +600,9 @@ def transcode_cmd(
     result = run_pipeline(video, output_dir, profile_cfg)
 
     if result.success:
-        in_mb = result.input_size / (1024 * 1024)
-        out_mb = result.output_size / (1024 * 1024)
-        ratio = result.compression_ratio
-        if ratio > 0:
-            change = f"{ratio * 100:.0f}% smaller"
-        elif ratio < 0:
-            change = f"{abs(ratio) * 100:.0f}% larger"
-        else:
-            change = "same size"
+        in_mb = _mb(result.input_size)
+        out_mb = _mb(result.output_size)
+        change = format_size_change(result.compression_ratio)
         console.print(f"[green]Success![/green] {in_mb:.1f}MB -> {out_mb:.1f}MB ({change})")
         console.print(f"Output: {result.output_path}")
     else:
@@ -521,6 +628,10 @@ def verify(
 
         imt verify output.mp4 -r original.MOV       # Compare with original
     """
+    from rich.table import Table
+
+    from .verifier import CheckStatus, verify_file
+
     console.print(f"\n[bold]Verifying:[/bold] {file.name}")
     if reference:
         console.print(f"[bold]Reference:[/bold] {reference.name}")
@@ -607,12 +718,14 @@ def compare(
     video: Annotated[Path, typer.Argument(help="Video file to compare", exists=True, dir_okay=False)],
     output: Annotated[Path | None, typer.Option("--output", "-o", help="Output directory")] = None,
     profiles_arg: Annotated[list[str] | None, typer.Option("--profile", "-p", help="Specific profiles to run")] = None,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="Profiles to encode at once")] = 1,
     config: ConfigOption = None,
 ):
     """
     Compare encoding profiles on a video file.
 
     Runs multiple encoding strategies and compares results (size, speed, quality).
+    Each profile's output goes to its own subfolder of the output directory.
 
     [bold]Examples:[/bold]
 
@@ -621,28 +734,35 @@ def compare(
         imt compare video.MOV -p nvenc_4k -p balanced  # Run specific profiles
 
         imt compare video.MOV -o /tmp/comparison     # Custom output dir
+
+        imt compare video.MOV -p archival -p compact -j 2  # Two CPU encodes at once
     """
     import time
 
-    # Load config
-    yaml_cfg = _load_yaml_config(config)
-    profiles = load_profiles_from_yaml(yaml_cfg)
+    from rich.table import Table
+
+    from .encoder import run_pipeline
+    from .profiles import load_profiles_from_yaml
+
+    # Load profiles
+    profiles = _load_config_profiles(config, load_profiles_from_yaml)
 
     if not profiles:
         console.print("[red]Error:[/red] No profiles defined in config")
         raise typer.Exit(1)
 
-    # Determine which profiles to run
+    # Determine which profiles to run, resolving each name once
     if profiles_arg:
-        profile_names = list(profiles_arg)
-        # Validate profile names
-        for name in profile_names:
-            if name not in profiles:
+        selected = []
+        for name in profiles_arg:
+            profile_cfg = profiles.get(name)
+            if profile_cfg is None:
                 console.print(f"[red]Error:[/red] Unknown profile: {name}")
                 console.print(f"Available: {', '.join(profiles.keys())}")
                 raise typer.Exit(1)
+            selected.append((name, profile_cfg))
     else:
-        profile_names = list(profiles.keys())
+        selected = list(profiles.items())
 
     # Setup output directory
     output_dir = output or video.parent / "comparison"
@@ -650,38 +770,54 @@ def compare(
 
     # Get input info
     input_size = video.stat().st_size
-    input_size_mb = input_size / (1024 * 1024)
+    input_size_mb = _mb(input_size)
 
     console.print(f"\n[bold]Comparing Profiles:[/bold] {video.name}")
     console.print(f"[bold]Input Size:[/bold] {input_size_mb:.1f} MB")
     console.print(f"[bold]Output Dir:[/bold] {output_dir}")
-    console.print(f"[bold]Profiles:[/bold] {', '.join(profile_names)}")
+    console.print(f"[bold]Profiles:[/bold] {', '.join(name for name, _ in selected)}")
     console.print()
 
-    # Run each profile
-    results: list[PipelineResult] = []
-
-    for name in profile_names:
-        profile_cfg = profiles[name]
-
-        console.print(f"[cyan]Running:[/cyan] {name} - {profile_cfg.description}")
+    # Every profile writes <stem>.mp4, so each gets its own subfolder whatever --jobs is
+    parallel = jobs > 1 and len(selected) > 1
 
+    def run_one(item: tuple[str, EncoderProfile]) -> tuple[PipelineResult, float]:
+        name, profile_cfg = item
         start_time = time.time()
-        result = run_pipeline(video, output_dir, profile_cfg)
-        elapsed = time.time() - start_time
+        result = run_pipeline(video, output_dir / name, profile_cfg)
+        return result, time.time() - start_time
 
+    def report(name: str, result: PipelineResult, elapsed: float) -> None:
+        label = f" {name}:" if parallel else ""
         if result.success:
-            in_mb = result.input_size / (1024 * 1024)
-            out_mb = result.output_size / (1024 * 1024)
+            in_mb = _mb(result.input_size)
+            out_mb = _mb(result.output_size)
             size_change = format_size_change(result.compression_ratio)
             speed = result.speed_ratio
             console.print(
-                f"  [green]✓[/green] {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change}) in {elapsed:.1f}s ({speed:.2f}x)"
+                f"  {_OK}{label} {in_mb:.1f}MB -> {out_mb:.1f}MB ({size_change}) in {elapsed:.1f}s ({speed:.2f}x)"
             )
         else:
-            console.print(f"  [red]✗[/red] Failed: {result.error_message}")
+            console.print(f"  {_FAIL}{label} Failed: {result.error_message}")
 
-        results.append(result)
+    # Run each profile
+    results: list[PipelineResult] = []
+
+    if parallel:
+        for name, profile_cfg in selected:
+            console.print(f"[cyan]Running:[/cyan] {name} - {profile_cfg.description}")
+        # Encoders are subprocesses, so threads only wait on them; results come back in selection order
+        with ThreadPoolExecutor(max_workers=min(jobs, len(selected))) as executor:
+            for (name, _), (result, elapsed) in zip(selected, executor.map(run_one, selected), strict=True):
+                report(name, result, elapsed)
+                results.append(result)
+    else:
+        for item in selected:
+            name, profile_cfg = item
+            console.print(f"[cyan]Running:[/cyan] {name} - {profile_cfg.description}")
+            result, elapsed = run_one(item)
+            report(name, result, elapsed)
+            results.append(result)
 
     # Summary table
     console.print()
@@ -698,23 +834,19 @@ def compare(
 
     for res in results:
         if res.success:
-            size_mb = res.output_size / (1024 * 1024)
+            size_mb = _mb(res.output_size)
             ratio = res.compression_ratio
-            if ratio > 0:
-                compression = f"-{abs(ratio) * 100:.0f}%"
-            elif ratio < 0:
-                compression = f"+{abs(ratio) * 100:.0f}%"
-            else:
-                compression = "0%"
+            # Size delta relative to the original: smaller output reads as a negative change
+            compression = f"{-ratio * 100:+.0f}%" if ratio else "0%"
             time_str = f"{res.encode_time_seconds:.1f}s"
             speed = f"{res.speed_ratio:.2f}x"
-            status_str = "[green]✓[/green]"
+            status_str = _OK
         else:
             size_mb = 0
             compression = "-"
             time_str = "-"
             speed = "-"
-            status_str = "[red]✗[/red]"
+            status_str = _FAIL
 
         table.add_row(
             res.pipeline_name, f"{size_mb:.1f} MB" if res.success else "-", compression, time_str, speed, status_str
@@ -747,6 +879,8 @@ def setup(
 
         imt setup --force           # Reinstall all tools
     """
+    from .setup_tools import run_setup
+
     success = run_setup(force)
     if not success:
         raise typer.Exit(1)
@@ -755,13 +889,16 @@ def setup(
 @app.command("list-profiles")
 def list_profiles(config: ConfigOption = None):
     """List available encoding profiles."""
-    yaml_cfg = _load_yaml_config(config)
-    profiles = load_profiles_from_yaml(yaml_cfg)
+    from .profiles import load_profiles_from_yaml
+
+    profiles = _load_config_profiles(config, load_profiles_from_yaml)
 
     if not profiles:
         console.print("[yellow]No profiles defined in config[/yellow]")
         return
 
+    from rich.table import Table
+
     table = Table(title="Available Encoding Profiles")
     table.add_column("Name", style="cyan")
     table.add_column("Encoder")
@@ -776,12 +913,12 @@ def list_profiles(config: ConfigOption = None):
         res = profile.resolution
         mode = profile.mode.value
 
-        if profile.mode.value == "crf":
+        if mode == "crf":
             quality = f"CRF {profile.crf or '?'}"
         else:
             quality = profile.bitrate or "?"
 
-        dv = "[green]✓[/green]" if profile.preserve_dolby_vision else "[dim]-[/dim]"
+        dv = _OK if profile.preserve_dolby_vision else "[dim]-[/dim]"
         desc = profile.description
 
         table.add_row(name, enc, res, mode, quality, dv, desc)
@@ -799,13 +936,23 @@ app.add_typer(dng_app)
 
 @dng_app.command("info")
 def dng_info(
-    file: Annotated[Path, typer.Argument(help="DNG file to analyze", exists=True, dir_okay=False)],
+    file: Annotated[Path, typer.Argument(help="DNG file to analyze (a folder with --batch)", exists=True)],
+    batch: Annotated[bool, typer.Option("--batch", "-b", help="Analyze every DNG in the folder, one row each")] = False,
 ):
     """
     Show DNG file information.
 
     Detects compression type (JXL/LJPEG), dimensions, and preview availability.
     """
+    if batch:
+        _dng_info_batch(file)
+        return
+    if file.is_dir():
+        console.print(f"[red]Error:[/red] {file} is a folder; use --batch to analyze the DNGs in it")
+        raise typer.Exit(1)
+
+    from rich.table import Table
+
     from .dng import detect_dng
 
     info = detect_dng(file)
@@ -815,14 +962,14 @@ def dng_info(
     table.add_column("Value", style="green")
 
     table.add_row("Path", str(info.path))
-    table.add_row("File Size", f"{info.file_size / (1024 * 1024):.1f} MB")
-    table.add_row("Compression", info.compression.value.upper())
+    table.add_row("File Size", f"{_mb(info.file_size):.1f} MB")
+    table.add_row("Compression", info.compression.name)
     table.add_row("Dimensions", f"{info.dimensions[0]}x{info.dimensions[1]}")
     table.add_row("Bits/Sample", str(info.bits_per_sample))
     table.add_row("Has Preview", "Yes" if info.has_preview else "No")
     if info.has_preview and info.preview_dimensions:
         table.add_row("Preview Size", f"{info.preview_dimensions[0]}x{info.preview_dimensions[1]}")
-        table.add_row("Preview Bytes", f"{info.preview_size / (1024 * 1024):.1f} MB")
+        table.add_row("Preview Bytes", f"{_mb(info.preview_size):.1f} MB")
     table.add_row(
         "Can Recompress JXL", "[green]Yes[/green]" if info.can_recompress_jxl else "[yellow]No (LJPEG)[/yellow]"
     )
@@ -830,6 +977,48 @@ def dng_info(
     console.print(table)
 
 
+def _dng_info_batch(folder: Path) -> None:
+    """Print one summary row per DNG directly in folder."""
+    if not folder.is_dir():
+        console.print(f"[red]Error:[/red] --batch expects a folder: {folder}")
+        raise typer.Exit(1)
+
+    with os.scandir(folder) as entries:
+        dngs = sorted(
+            Path(e.path) for e in entries if os.path.splitext(e.name)[1].lower() in DNG_EXTENSIONS and e.is_file()
+        )
+    if not dngs:
+        console.print("No DNG files found")
+        return
+
+    from rich.table import Table
+
+    from .dng import detect_dng_many
+
+    table = Table(title=f"DNG Info: {folder.name}")
+    table.add_column("File", style="cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Compression")
+    table.add_column("Dimensions", justify="right")
+    table.add_column("Bits", justify="right")
+    table.add_column("Preview", justify="right")
+    table.add_column("JXL Recompress")
+
+    for info in detect_dng_many(dngs):
+        preview = f"{_mb(info.preview_size):.1f} MB" if info.has_preview else "-"
+        table.add_row(
+            info.path.name,
+            f"{_mb(info.file_size):.1f} MB",
+            info.compression.name,
+            f"{info.dimensions[0]}x{info.dimensions[1]}",
+            str(info.bits_per_sample),
+            preview,
+            "[green]Yes[/green]" if info.can_recompress_jxl else "[yellow]No[/yellow]",
+        )
+
+    console.print(table)
+
+
 @dng_app.command("compress")
 def dng_compress(
     input_file: Annotated[Path, typer.Argument(help="Input DNG file", exists=True, dir_okay=False)],
@@ -859,9 +1048,8 @@ def dng_compress(
         load_dng_profiles,
     )
 
-    # Load config and profiles
-    yaml_cfg = _load_yaml_config(config)
-    profiles = load_dng_profiles(yaml_cfg)
+    # Load profiles
+    profiles = _load_config_profiles(config, load_dng_profiles)
 
     if profile not in profiles:
         console.print(f"[red]Error:[/red] Unknown profile: {profile}")
@@ -874,7 +1062,7 @@ def dng_compress(
     info = detect_dng(input_file)
 
     console.print(f"[bold]Input:[/bold] {input_file.name}")
-    console.print(f"[bold]Compression:[/bold] {info.compression.value.upper()}")
+    console.print(f"[bold]Compression:[/bold] {info.compression.name}")
     console.print(f"[bold]Profile:[/bold] {profile} - {prof.description}")
     console.print()
 
@@ -885,11 +1073,11 @@ def dng_compress(
             output = input_file.with_suffix(".jpg")
 
         with console.status("Extracting Apple preview..."):
-            result = extract_preview(input_file, output)
+            result = extract_preview(input_file, output, info=info)
 
         if result.success:
-            in_mb = result.input_size / (1024 * 1024)
-            out_mb = result.output_size / (1024 * 1024)
+            in_mb = _mb(result.input_size)
+            out_mb = _mb(result.output_size)
             reduction = result.size_reduction * 100
             console.print(f"[green]Success![/green] {in_mb:.1f}MB → {out_mb:.1f}MB ({reduction:.0f}% smaller)")
             console.print(f"Output: {result.output_path}")
@@ -903,7 +1091,7 @@ def dng_compress(
             if output is None:
                 output = input_file.with_stem(f"{input_file.stem}_recomp")
 
-            with console.status(f"Compressing {info.compression.value.upper()} DNG (d={prof.distance})..."):
+            with console.status(f"Compressing {info.compression.name} DNG (d={prof.distance})..."):
                 result = compress_jxl_dng(
                     input_file,
                     output,
@@ -912,8 +1100,8 @@ def dng_compress(
                 )
 
             if result.success:
-                in_mb = result.input_size / (1024 * 1024)
-                out_mb = result.output_size / (1024 * 1024)
+                in_mb = _mb(result.input_size)
+                out_mb = _mb(result.output_size)
                 reduction = result.size_reduction * 100
                 console.print(f"[green]Success![/green] {in_mb:.1f}MB → {out_mb:.1f}MB ({reduction:.0f}% smaller)")
                 console.print(f"Tiles processed: {result.tiles_processed}")
@@ -961,11 +1149,11 @@ def dng_preview(
     console.print()
 
     with console.status("Extracting preview..."):
-        result = extract_preview(input_file, output)
+        result = extract_preview(input_file, output, info=info)
 
     if result.success:
-        in_mb = result.input_size / (1024 * 1024)
-        out_mb = result.output_size / (1024 * 1024)
+        in_mb = _mb(result.input_size)
+        out_mb = _mb(result.output_size)
         reduction = result.size_reduction * 100
         console.print(f"[green]Success![/green] {in_mb:.1f}MB → {out_mb:.1f}MB ({reduction:.0f}% smaller)")
         console.print(f"Output: {result.output_path}")
@@ -977,10 +1165,11 @@ def dng_preview(
 @dng_app.command("list-profiles")
 def dng_list_profiles(config: ConfigOption = None):
     """List available DNG compression profiles."""
+    from rich.table import Table
+
     from .dng import load_dng_profiles
 
-    yaml_cfg = _load_yaml_config(config)
-    profiles = load_dng_profiles(yaml_cfg)
+    profiles = _load_config_profiles(config, load_dng_profiles)
 
     table = Table(title="DNG Compression Profiles")
     table.add_column("Name", style="cyan")
@@ -989,12 +1178,13 @@ def dng_list_profiles(config: ConfigOption = None):
     table.add_column("Description")
 
     for name, prof in profiles.items():
-        if prof.method.value == "jxl_recompress":
+        method = prof.method.value
+        if method == "jxl_recompress":
             settings = f"d={prof.distance}, e={prof.effort}"
         else:
             settings = f"q={prof.quality}"
 
-        table.add_row(name, prof.method.value, settings, prof.description)
+        table.add_row(name, method, settings, prof.description)
 
     console.print(table)
 
@@ -2,11 +2,79 @@
 Configuration management with YAML loading and environment variable support.
 """
 
+import copy
+import hashlib
+import json
 import os
-from dataclasses import dataclass, field
+import tempfile
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 
-import yaml
+
+def _yaml_cache_file(path: Path) -> Path:
+    """Location of the parsed-YAML cache for path (XDG cache dir, one file per resolved path)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    name = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:32]
+    return Path(base) / "ios-media-toolkit" / "config" / f"{name}.json"
+
+
+def _read_yaml_cache(cache_file: Path, st: os.stat_result) -> dict | None:
+    """Return cached YAML data if it was written for this YAML mtime and size."""
+    try:
+        cached = json.loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict):
+        return None
+    if cached.get("mtime_ns") != st.st_mtime_ns or cached.get("size") != st.st_size:
+        return None
+    return cached.get("data")
+
+
+def _write_yaml_cache(cache_file: Path, path: Path, st: os.stat_result, data: dict) -> None:
+    """Best-effort atomic write of the YAML cache; skipped if data isn't JSON-exact."""
+    try:
+        payload = json.dumps({"path": str(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "data": data})
+    except (TypeError, ValueError):
+        return
+    # YAML allows non-string keys etc. that JSON would silently coerce
+    if json.loads(payload)["data"] != data:
+        return
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, prefix=f"{cache_file.name}.", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with open(fd, "w") as f:
+            f.write(payload)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+
+
+def load_yaml_data(path: Path) -> dict:
+    """
+    Parse a YAML file, reusing its cached parse from the XDG cache dir when current.
+
+    The cache records the YAML mtime and size it was written for, so an edited
+    file is parsed again; yaml itself is only imported on a cache miss.
+
+    Raises:
+        FileNotFoundError: If path doesn't exist
+    """
+    st = path.stat()
+    cache_file = _yaml_cache_file(path)
+    data = _read_yaml_cache(cache_file, st)
+    if data is None:
+        import yaml
+
+        # libyaml-backed loader when PyYAML was built with it; same safe semantics
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path) as f:
+            data = yaml.load(f, Loader=loader) or {}
+        _write_yaml_cache(cache_file, path, st, data)
+    return data
 
 
 def _get_default_data_dir() -> Path:
@@ -83,6 +151,24 @@ class LoggingConfig:
     console_logging: bool = True
 
 
+# AppConfig section attributes, in YAML order
+_SECTIONS = ("paths", "transcode", "convert", "output", "favorites", "processing", "logging")
+
+# Settable field names per section, so unknown YAML keys are skipped without hasattr()
+_SECTION_FIELDS = {
+    name: frozenset(f.name for f in fields(section_cls))
+    for name, section_cls in (
+        ("paths", PathsConfig),
+        ("transcode", TranscodeConfig),
+        ("convert", ConvertConfig),
+        ("output", OutputConfig),
+        ("favorites", FavoritesConfig),
+        ("processing", ProcessingConfig),
+        ("logging", LoggingConfig),
+    )
+}
+
+
 @dataclass
 class AppConfig:
     paths: PathsConfig = field(default_factory=PathsConfig)
@@ -96,81 +182,52 @@ class AppConfig:
     @classmethod
     def from_yaml(cls, path: Path) -> AppConfig:
         """Load configuration from YAML file."""
-        if not path.exists():
+        try:
+            data = load_yaml_data(path)
+        except FileNotFoundError:
             return cls()
 
-        with open(path) as f:
-            data = yaml.safe_load(f) or {}
-
         return cls._from_dict(data)
 
     @classmethod
     def _from_dict(cls, data: dict) -> AppConfig:
         """Create config from dictionary."""
         config = cls()
-
-        if "paths" in data:
-            for key, value in data["paths"].items():
-                if hasattr(config.paths, key):
-                    setattr(config.paths, key, Path(value) if isinstance(value, str) else value)
-
-        if "transcode" in data:
-            for key, value in data["transcode"].items():
-                if hasattr(config.transcode, key):
-                    setattr(config.transcode, key, value)
-
-        if "convert" in data:
-            for key, value in data["convert"].items():
-                if hasattr(config.convert, key):
-                    setattr(config.convert, key, value)
-
-        if "output" in data:
-            for key, value in data["output"].items():
-                if hasattr(config.output, key):
-                    setattr(config.output, key, value)
-
-        if "favorites" in data:
-            for key, value in data["favorites"].items():
-                if hasattr(config.favorites, key):
-                    setattr(config.favorites, key, value)
-
-        if "processing" in data:
-            for key, value in data["processing"].items():
-                if hasattr(config.processing, key):
-                    setattr(config.processing, key, value)
-
-        if "logging" in data:
-            for key, value in data["logging"].items():
-                if hasattr(config.logging, key):
-                    setattr(config.logging, key, value)
-
+        config._apply(data)
         return config
 
+    def _apply(self, data: dict) -> None:
+        """Set the known section fields found in data, in place."""
+        for section_name, section_fields in _SECTION_FIELDS.items():
+            if section_name not in data:
+                continue
+            section = getattr(self, section_name)
+            for key, value in data[section_name].items():
+                if key in section_fields:
+                    if section_name == "paths" and isinstance(value, str):
+                        value = Path(value)
+                    setattr(section, key, value)
+
     def merge_album_config(self, album_config_path: Path) -> AppConfig:
         """Merge album-specific config overrides."""
-        if not album_config_path.exists():
+        try:
+            overrides = load_yaml_data(album_config_path)
+        except FileNotFoundError:
             return self
 
-        with open(album_config_path) as f:
-            overrides = yaml.safe_load(f) or {}
-
-        # Create a copy and apply overrides
-        merged = AppConfig._from_dict({})
-
-        # Copy current values
-        for attr in ["paths", "transcode", "convert", "output", "favorites", "processing", "logging"]:
-            src = getattr(self, attr)
-            dst = getattr(merged, attr)
-            for key in vars(src):
-                setattr(dst, key, getattr(src, key))
+        # Overrides replace individual fields; everything else keeps this config's values
+        merged = self._copy()
+        merged._apply(overrides)
+        return merged
 
-        # Apply overrides
-        return AppConfig._from_dict({**self._to_dict(), **overrides})
+    def _copy(self) -> AppConfig:
+        """Copy each section; field values (Paths included) are immutable and shared as-is."""
+        return AppConfig(**{attr: copy.copy(getattr(self, attr)) for attr in _SECTIONS})
 
     def _to_dict(self) -> dict:
         """Convert config to dictionary."""
         result = {}
-        for attr in ["paths", "transcode", "convert", "output", "favorites", "processing", "logging"]:
+        for attr in _SECTIONS:
             section = getattr(self, attr)
             result[attr] = {
                 key: str(value) if isinstance(value, Path) else value for key, value in vars(section).items()
@@ -5,35 +5,20 @@ All file extension sets and other constants should be defined here
 to avoid duplication across modules.
 """
 
-# Video file extensions (case-insensitive matching via both cases)
-VIDEO_EXTENSIONS = {".mov", ".mp4", ".m4v", ".avi", ".mkv", ".MOV", ".MP4", ".M4V", ".AVI", ".MKV"}
+# Video file extensions (lowercase; match against path.suffix.lower())
+VIDEO_EXTENSIONS = frozenset({".mov", ".mp4", ".m4v", ".avi", ".mkv"})
 
-# Photo file extensions
-PHOTO_EXTENSIONS = {
-    ".heic",
-    ".HEIC",
-    ".heif",
-    ".HEIF",
-    ".jpg",
-    ".JPG",
-    ".jpeg",
-    ".JPEG",
-    ".png",
-    ".PNG",
-    ".dng",
-    ".DNG",
-    ".raw",
-    ".RAW",
-}
+# Photo file extensions (lowercase; match against path.suffix.lower())
+PHOTO_EXTENSIONS = frozenset({".heic", ".heif", ".jpg", ".jpeg", ".png", ".dng", ".raw"})
 
-# MOV files only (iPhone raw video format)
-MOV_EXTENSIONS = {".mov", ".MOV"}
+# MOV files only (iPhone raw video format; lowercase, match against path.suffix.lower())
+MOV_EXTENSIONS = frozenset({".mov"})
 
-# DNG/ProRAW files
-DNG_EXTENSIONS = {".dng", ".DNG"}
+# DNG/ProRAW files (lowercase; match against path.suffix.lower())
+DNG_EXTENSIONS = frozenset({".dng"})
 
-# Sidecar file extensions
-SIDECAR_EXTENSIONS = {".xmp", ".XMP", ".aae", ".AAE", ".json", ".JSON"}
+# Sidecar file extensions (lowercase; match against path.suffix.lower())
+SIDECAR_EXTENSIONS = frozenset({".xmp", ".aae", ".json"})
 
 # Favorite suffix for output files
 FAV_SUFFIX = "__FAV"
@@ -10,25 +10,39 @@ because dcraw applies color processing during decode, causing color shifts.
 For LJPEG DNGs, use Apple Preview extraction instead.
 """
 
-from .detector import DngCompression, DngInfo, detect_dng
-from .jxl_compressor import CompressionResult, JxlProfile, compress_jxl_dng
-from .preview_extractor import ExtractionResult, extract_preview
-from .profiles import DngMethod, DngProfile, load_dng_profiles
+import importlib
 
-__all__ = [
+# Public name -> submodule that defines it; submodules load on first access (PEP 562)
+_EXPORTS = {
     # Detector
-    "DngCompression",
-    "DngInfo",
-    "detect_dng",
+    "DngCompression": "detector",
+    "DngInfo": "detector",
+    "detect_dng": "detector",
+    "detect_dng_many": "detector",
     # JXL Compressor
-    "JxlProfile",
-    "CompressionResult",
-    "compress_jxl_dng",
+    "JxlProfile": "jxl_compressor",
+    "CompressionResult": "jxl_compressor",
+    "compress_jxl_dng": "jxl_compressor",
     # Preview Extractor
-    "ExtractionResult",
-    "extract_preview",
+    "ExtractionResult": "preview_extractor",
+    "extract_preview": "preview_extractor",
     # Profiles
-    "DngMethod",
-    "DngProfile",
-    "load_dng_profiles",
-]
+    "DngMethod": "profiles",
+    "DngProfile": "profiles",
+    "load_dng_profiles": "profiles",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -5,26 +5,24 @@ Detects compression type (JXL, LJPEG, uncompressed) and extracts metadata
 from ProRAW DNG files.
 """
 
+import mmap
 import struct
-import subprocess
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 
-class DngCompression(Enum):
-    """DNG compression types."""
+class DngCompression(IntEnum):
+    """DNG compression types; values are the TIFF Compression tag values."""
 
-    JXL = "jxl"  # JPEG XL (iPhone 17+)
-    LJPEG = "ljpeg"  # Lossless JPEG (iPhone 12-16 "Most Compatible")
-    UNCOMPRESSED = "uncompressed"
-    UNKNOWN = "unknown"
-
-
-# TIFF compression tag values
-COMPRESSION_NONE = 1
-COMPRESSION_LJPEG = 7  # Lossless JPEG
-COMPRESSION_JXL = 52546  # JPEG XL
+    UNKNOWN = 0
+    UNCOMPRESSED = 1
+    LJPEG = 7  # Lossless JPEG (iPhone 12-16 "Most Compatible")
+    JXL = 52546  # JPEG XL (iPhone 17+)
 
 
 @dataclass
@@ -40,6 +38,7 @@ class DngInfo:
     preview_dimensions: tuple[int, int] | None
     preview_size: int  # Size of embedded preview in bytes
     file_size: int
+    preview_offset: int = 0  # File offset of the preview JPEG when stored contiguously, else 0
 
     @property
     def is_jxl(self) -> bool:
@@ -59,10 +58,82 @@ class DngInfo:
         return self.compression == DngCompression.JXL
 
 
-def _read_compression_from_tiff(path: Path) -> int:
-    """Read compression tag from TIFF/DNG, checking SubIFDs for main image."""
+# Reported for files that are not TIFF or lack a tag
+_EMPTY_IFD_INFO = {
+    "compression": 0,
+    "width": 0,
+    "height": 0,
+    "bits_per_sample": 0,
+    "preview_length": 0,
+    "preview_offset": 0,
+    "preview_width": 0,
+    "preview_height": 0,
+}
+
+# TIFF tags read by _parse_tiff_data
+_TAG_NEW_SUBFILE_TYPE = 254
+_TAG_IMAGE_WIDTH = 256
+_TAG_IMAGE_LENGTH = 257
+_TAG_BITS_PER_SAMPLE = 258
+_TAG_COMPRESSION = 259
+_TAG_STRIP_OFFSETS = 273
+_TAG_STRIP_BYTE_COUNTS = 279
+_TAG_TILE_BYTE_COUNTS = 325
+_TAG_SUB_IFDS = 330
+_TAG_JPEG_IF_OFFSET = 513
+_TAG_JPEG_IF_LENGTH = 514
+
+# Compression values of embedded JPEG previews (6 = old-style JPEG, 7 = JPEG)
+_JPEG_COMPRESSIONS = (6, DngCompression.LJPEG)
+
+# Byte order mark plus the magic number 42, little- and big-endian
+_TIFF_MAGIC = (b"II*\0", b"MM\0*")
+
+# Precompiled unpackers by byte order ("<" for II, ">" for MM)
+_U16 = {e: struct.Struct(f"{e}H") for e in "<>"}
+_U32 = {e: struct.Struct(f"{e}I") for e in "<>"}
+# One 12-byte IFD entry: tag, type, count, value/offset
+_IFD_ENTRY = {e: struct.Struct(f"{e}HHII") for e in "<>"}
+
+# TIFF field type -> (struct code, byte size) for the integer types we read
+_TIFF_INT_TYPES = {1: ("B", 1), 3: ("H", 2), 4: ("I", 4), 13: ("I", 4)}
+
+
+def _parse_dng_ifds(path: Path) -> dict[str, int]:
+    """
+    Read main image and preview metadata straight from the TIFF/DNG IFDs.
+
+    Returns a dict with compression, width, height, bits_per_sample,
+    preview_length, preview_offset, preview_width and preview_height
+    (0 when absent).
+    """
     with open(path, "rb") as f:
-        data = f.read()
+        # Reject non-TIFF files (e.g. JPEGs named .DNG) from the 8-byte header alone
+        header = f.read(8)
+        if len(header) < 8 or header[:4] not in _TIFF_MAGIC:
+            return dict(_EMPTY_IFD_INFO)
+        # Map instead of read(): only the pages holding the header and IFDs are faulted in
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return _parse_tiff_data(data)
+    finally:
+        data.close()
+
+
+@lru_cache(maxsize=1024)
+def _parse_tiff_cached(real_path: str, size: int, mtime_ns: int) -> Mapping[str, int]:
+    """
+    Per-process memo of _parse_dng_ifds, keyed on the resolved path, size and mtime.
+
+    Resolving first means the same file reached through a different spelling
+    (relative path, symlink) is parsed once; a size or mtime change re-parses.
+    """
+    return MappingProxyType(_parse_dng_ifds(Path(real_path)))
+
+
+def _parse_tiff_data(data: mmap.mmap) -> dict[str, int]:
+    """Walk TIFF header and IFDs in data; see _parse_dng_ifds."""
+    info = dict(_EMPTY_IFD_INFO)
 
     # Check endianness
     if data[:2] == b"II":
@@ -70,144 +141,160 @@ def _read_compression_from_tiff(path: Path) -> int:
     elif data[:2] == b"MM":
         endian = ">"
     else:
-        return 0
+        return info
+
+    # Precompiled unpackers for this byte order
+    u16 = _U16[endian].unpack_from
+    u32 = _U32[endian].unpack_from
+    ifd_entries = _IFD_ENTRY[endian].iter_unpack
 
     # Check TIFF magic
-    if struct.unpack(endian + "H", data[2:4])[0] != 42:
-        return 0
+    if len(data) < 8 or u16(data, 2)[0] != 42:
+        return info
 
     def read_ifd(off: int) -> tuple[dict, int]:
         """Read IFD entries and return (entries dict, next_ifd offset)."""
         if off >= len(data) - 2:
             return {}, 0
-        n = struct.unpack_from(endian + "H", data, off)[0]
-        pos = off + 2
-        entries = {}
-        for _ in range(n):
-            if pos + 12 > len(data):
-                break
-            tag = struct.unpack_from(endian + "H", data, pos)[0]
-            typ = struct.unpack_from(endian + "H", data, pos + 2)[0]
-            cnt = struct.unpack_from(endian + "I", data, pos + 4)[0]
-            val = struct.unpack_from(endian + "I", data, pos + 8)[0]
-            entries[tag] = (typ, cnt, val, pos + 8)
-            pos += 12
-        next_ifd = struct.unpack_from(endian + "I", data, pos)[0] if pos + 4 <= len(data) else 0
+        start = off + 2
+        # All entries in one C-level pass; a truncated table stops at the last whole entry
+        n = min(u16(data, off)[0], (len(data) - start) // 12)
+        end = start + 12 * n
+        entries = {
+            tag: (typ, cnt, val, start + 12 * i + 8)
+            for i, (tag, typ, cnt, val) in enumerate(ifd_entries(data[start:end]))
+        }
+        next_ifd = u32(data, end)[0] if end + 4 <= len(data) else 0
         return entries, next_ifd
 
-    def get_compression(entries: dict) -> int:
-        """Get compression value from IFD entries."""
-        if 259 not in entries:
-            return 0
-        typ, cnt, val, vpos = entries[259]
-        if typ == 3:  # SHORT
-            return struct.unpack_from(endian + "H", data, vpos)[0]
-        return val
-
-    # Read IFD0
-    ifd0_off = struct.unpack(endian + "I", data[4:8])[0]
-    entries, _ = read_ifd(ifd0_off)
-
-    # Check SubIFDs (tag 330) - main RAW image is typically here
-    if 330 in entries:
-        typ, cnt, val, vpos = entries[330]
-        if typ == 4:  # LONG array
-            if cnt == 1:
-                suboffs = [val]
-            else:
-                suboffs = list(struct.unpack_from(endian + f"{cnt}I", data, val))
-
-            for suboff in suboffs:
-                sub_entries, _ = read_ifd(suboff)
-                comp = get_compression(sub_entries)
-                if comp == COMPRESSION_JXL:
-                    return comp  # Found JXL in SubIFD
-
-    # Fallback to IFD0 compression
-    return get_compression(entries)
+    def get_values(entries: dict, tag: int) -> tuple[int, ...]:
+        """Get the integer values of a tag; inline when they fit in 4 bytes, else at the offset."""
+        if tag not in entries:
+            return ()
+        typ, cnt, val, vpos = entries[tag]
+        if typ not in _TIFF_INT_TYPES or cnt == 0:
+            return ()
+        code, size = _TIFF_INT_TYPES[typ]
+        off = vpos if cnt * size <= 4 else val
+        if off + cnt * size > len(data):
+            return ()
+        return struct.unpack_from(f"{endian}{cnt}{code}", data, off)
+
+    def get_value(entries: dict, tag: int) -> int:
+        """Get the first value of a tag, or 0."""
+        values = get_values(entries, tag)
+        return values[0] if values else 0
+
+    # Read IFD0, then its SubIFDs (tag 330) and the next-IFD chain (IFD1 thumbnail, ...)
+    ifd0_off = u32(data, 4)[0]
+    ifd0, next_off = read_ifd(ifd0_off)
+    sub_ifds = [read_ifd(off)[0] for off in get_values(ifd0, _TAG_SUB_IFDS)]
+    chained = []
+    seen = {ifd0_off}
+    while next_off and next_off not in seen and len(seen) < 16:
+        seen.add(next_off)
+        entries, next_off = read_ifd(next_off)
+        chained.append(entries)
+
+    # Compression: JXL in any SubIFD (main RAW image), else IFD0's value
+    info["compression"] = get_value(ifd0, _TAG_COMPRESSION)
+    for entries in sub_ifds:
+        if get_value(entries, _TAG_COMPRESSION) == DngCompression.JXL:
+            info["compression"] = DngCompression.JXL
+            break
+
+    # Main image: the full-resolution IFD (NewSubFileType 0), falling back to IFD0
+    ifds = [ifd0, *sub_ifds, *chained]
+    main = next(
+        (e for e in ifds if _TAG_IMAGE_WIDTH in e and get_value(e, _TAG_NEW_SUBFILE_TYPE) == 0),
+        ifd0,
+    )
+    info["width"] = get_value(main, _TAG_IMAGE_WIDTH)
+    info["height"] = get_value(main, _TAG_IMAGE_LENGTH)
+    info["bits_per_sample"] = get_value(main, _TAG_BITS_PER_SAMPLE)
+
+    # Preview: the largest reduced-resolution JPEG
+    for entries in ifds:
+        if not get_value(entries, _TAG_NEW_SUBFILE_TYPE) & 1:
+            continue
+        if get_value(entries, _TAG_COMPRESSION) not in _JPEG_COMPRESSIONS:
+            continue
+        if length := get_value(entries, _TAG_JPEG_IF_LENGTH):
+            offset = get_value(entries, _TAG_JPEG_IF_OFFSET)
+        else:
+            strip_counts = get_values(entries, _TAG_STRIP_BYTE_COUNTS)
+            length = sum(strip_counts or get_values(entries, _TAG_TILE_BYTE_COUNTS))
+            # Only a single strip is one contiguous JPEG that can be read directly
+            offset = get_value(entries, _TAG_STRIP_OFFSETS) if len(strip_counts) == 1 else 0
+        if length > info["preview_length"]:
+            info["preview_length"] = length
+            info["preview_offset"] = offset if offset + length <= len(data) else 0
+            info["preview_width"] = get_value(entries, _TAG_IMAGE_WIDTH)
+            info["preview_height"] = get_value(entries, _TAG_IMAGE_LENGTH)
+
+    return info
 
 
 def detect_dng(path: Path) -> DngInfo:
     """
     Detect DNG type and extract metadata.
 
-    Uses exiftool for reliable metadata extraction.
+    Reads the TIFF/DNG IFDs directly (no exiftool). The parse is memoized for
+    the rest of the process by (resolved path, mtime, size), so an unchanged
+    file is only inspected once.
 
     Args:
         path: Path to DNG file
 
     Returns:
-        DngInfo with file details
+        DngInfo with file details (UNKNOWN compression if not a TIFF/DNG)
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        ValueError: If file is not a valid DNG
     """
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {path}")
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {path}") from None
 
-    # Read compression directly from TIFF header (more reliable than exiftool for this)
-    compression_value = _read_compression_from_tiff(path)
+    ifd_info = _parse_tiff_cached(str(path.resolve()), st.st_size, st.st_mtime_ns)
+    compression_value = ifd_info["compression"]
 
     # Map compression value to enum
-    if compression_value == COMPRESSION_JXL:
-        compression = DngCompression.JXL
-    elif compression_value == COMPRESSION_LJPEG:
-        compression = DngCompression.LJPEG
-    elif compression_value == COMPRESSION_NONE:
-        compression = DngCompression.UNCOMPRESSED
-    else:
-        compression = DngCompression.UNKNOWN
-
-    # Use exiftool for other metadata
-    cmd = [
-        "exiftool",
-        "-s",
-        "-s",
-        "-s",
-        "-ImageWidth",
-        "-ImageHeight",
-        "-BitsPerSample",
-        "-PreviewImageLength",
-        "-PreviewImageWidth",
-        "-PreviewImageHeight",
-        str(path),
-    ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    # Parse output (one value per line)
-    lines = result.stdout.strip().split("\n")
-    values = [line.strip() if line.strip() else "0" for line in lines]
-
-    # Pad with defaults if exiftool didn't return all fields
-    while len(values) < 6:
-        values.append("0")
-
     try:
-        width = int(values[0]) if values[0] else 0
-        height = int(values[1]) if values[1] else 0
-        # BitsPerSample may be "10 10 10" for 3 channels
-        bps_str = values[2].split()[0] if values[2] else "0"
-        bits_per_sample = int(bps_str) if bps_str else 0
-        preview_length = int(values[3]) if values[3] else 0
-        preview_width = int(values[4]) if values[4] else 0
-        preview_height = int(values[5]) if values[5] else 0
-    except (ValueError, IndexError):
-        width = height = bits_per_sample = 0
-        preview_length = preview_width = preview_height = 0
+        compression = DngCompression(compression_value)
+    except ValueError:
+        compression = DngCompression.UNKNOWN
 
+    preview_length = ifd_info["preview_length"]
     has_preview = preview_length > 0
-    preview_dims = (preview_width, preview_height) if has_preview else None
+    preview_dims = (ifd_info["preview_width"], ifd_info["preview_height"]) if has_preview else None
 
     return DngInfo(
         path=path,
         compression=compression,
         compression_value=compression_value,
-        dimensions=(width, height),
-        bits_per_sample=bits_per_sample,
+        dimensions=(ifd_info["width"], ifd_info["height"]),
+        bits_per_sample=ifd_info["bits_per_sample"],
         has_preview=has_preview,
         preview_dimensions=preview_dims,
         preview_size=preview_length,
-        file_size=path.stat().st_size,
+        file_size=st.st_size,
+        preview_offset=ifd_info["preview_offset"],
     )
+
+
+def detect_dng_many(paths: Iterable[Path]) -> list[DngInfo]:
+    """
+    Detect several DNGs concurrently, in input order.
+
+    Header reads overlap across threads.
+
+    Raises:
+        FileNotFoundError: If any file doesn't exist
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        return list(executor.map(detect_dng, paths))
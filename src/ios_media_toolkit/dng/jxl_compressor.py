@@ -8,13 +8,19 @@ Only works for iPhone 17+ JXL DNGs. LJPEG DNGs cannot be reliably
 recompressed because dcraw applies color processing during decode.
 """
 
+import hashlib
+import mmap
 import os
 import struct
 import subprocess
 import tempfile
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from typing import BinaryIO
 
 import numpy as np
 
@@ -36,6 +42,18 @@ TIFF_TYPE_SIZE = {
     12: 8,  # DOUBLE
 }
 
+# Precompiled TIFF structs per byte order ("<" for II, ">" for MM)
+_U16 = {e: struct.Struct(f"{e}H") for e in "<>"}
+_U32 = {e: struct.Struct(f"{e}I") for e in "<>"}
+# IFD entry: tag, type, count, value/offset
+_IFD_ENTRY = {e: struct.Struct(f"{e}HHII") for e in "<>"}
+# Struct codes / numpy dtypes for the value arrays that are read and patched (SHORT, LONG, SLONG)
+_VALUE_CODES = {3: "H", 4: "I", 9: "i"}
+_VALUE_DTYPES = {3: "u2", 4: "u4", 9: "i4"}
+# Arrays longer than this (tile offsets/bytecounts) are viewed with numpy instead of unpacked to ints
+_ARRAY_MIN_COUNT = 16
+
+TAG_NEW_SUBFILE_TYPE = 254
 TAG_IMAGE_WIDTH = 256
 TAG_IMAGE_LENGTH = 257
 TAG_COMPRESSION = 259
@@ -50,6 +68,9 @@ TAG_BLACKLEVEL = 50714
 
 COMPRESSION_JXL = 52546
 
+# Tiles are transcoded concurrently; the work runs in djxl/cjxl child processes
+TILE_WORKERS = os.cpu_count() or 1
+
 
 @dataclass
 class JxlProfile:
@@ -100,22 +121,20 @@ class _Ifd:
 
 
 def _read_u16(endian: str, data: bytes, off: int) -> int:
-    return struct.unpack_from(endian + "H", data, off)[0]
+    return _U16[endian].unpack_from(data, off)[0]
 
 
 def _read_u32(endian: str, data: bytes, off: int) -> int:
-    return struct.unpack_from(endian + "I", data, off)[0]
+    return _U32[endian].unpack_from(data, off)[0]
 
 
 def _parse_ifd(endian: str, data: bytes, off: int) -> _Ifd:
     n = _read_u16(endian, data, off)
     pos = off + 2
+    unpack_entry = _IFD_ENTRY[endian].unpack_from
     entries: dict[int, _IfdEntry] = {}
     for _ in range(n):
-        tag = _read_u16(endian, data, pos)
-        typ = _read_u16(endian, data, pos + 2)
-        count = _read_u32(endian, data, pos + 4)
-        value_u32 = _read_u32(endian, data, pos + 8)
+        tag, typ, count, value_u32 = unpack_entry(data, pos)
         unit = TIFF_TYPE_SIZE.get(typ, 1)
         total = unit * count
         value_pos = (pos + 8) if total <= 4 else value_u32
@@ -125,42 +144,43 @@ def _parse_ifd(endian: str, data: bytes, off: int) -> _Ifd:
     return _Ifd(off, entries, next_ifd)
 
 
-def _read_values(endian: str, data: bytes, e: _IfdEntry) -> list[int]:
-    if e.typ == 3:  # SHORT
-        raw = data[e.value_pos : e.value_pos + max(4, e.count * 2)]
-        raw = raw[: e.count * 2]
-        return list(struct.unpack(endian + f"{e.count}H", raw))
-    if e.typ == 4:  # LONG
-        raw = data[e.value_pos : e.value_pos + max(4, e.count * 4)]
-        raw = raw[: e.count * 4]
-        return list(struct.unpack(endian + f"{e.count}I", raw))
-    if e.typ == 9:  # SLONG
-        raw = data[e.value_pos : e.value_pos + max(4, e.count * 4)]
-        raw = raw[: e.count * 4]
-        return list(struct.unpack(endian + f"{e.count}i", raw))
-    raise ValueError(f"Unsupported TIFF type {e.typ} for tag {e.tag}")
+@lru_cache(maxsize=256)
+def _values_struct(endian: str, typ: int, count: int) -> struct.Struct:
+    return struct.Struct(f"{endian}{count}{_VALUE_CODES[typ]}")
+
+
+def _values_view(endian: str, buf: bytes | bytearray, e: _IfdEntry) -> np.ndarray:
+    dtype = np.dtype(endian + _VALUE_DTYPES[e.typ])
+    return np.frombuffer(buf, dtype=dtype, count=e.count, offset=e.value_pos)
+
+
+def _check_value_type(e: _IfdEntry) -> None:
+    if e.typ not in _VALUE_CODES:
+        raise ValueError(f"Unsupported TIFF type {e.typ} for tag {e.tag}")
+
 
+def _read_values(endian: str, data: bytes, e: _IfdEntry) -> tuple[int, ...] | np.ndarray:
+    _check_value_type(e)
+    if e.count > _ARRAY_MIN_COUNT:
+        return _values_view(endian, data, e)
+    return _values_struct(endian, e.typ, e.count).unpack_from(data, e.value_pos)
 
-def _write_values(endian: str, buf: bytearray, e: _IfdEntry, vals: list[int]) -> None:
+
+def _write_values(endian: str, buf: bytearray, e: _IfdEntry, vals: list[int] | np.ndarray) -> None:
     if len(vals) != e.count:
         raise ValueError(f"Count mismatch for tag {e.tag}: expected {e.count}, got {len(vals)}")
-    if e.typ == 3:  # SHORT
-        packed = struct.pack(endian + f"{e.count}H", *vals)
-        buf[e.value_pos : e.value_pos + len(packed)] = packed
-    elif e.typ == 4:  # LONG
-        packed = struct.pack(endian + f"{e.count}I", *vals)
-        buf[e.value_pos : e.value_pos + len(packed)] = packed
-    elif e.typ == 9:  # SLONG
-        packed = struct.pack(endian + f"{e.count}i", *vals)
-        buf[e.value_pos : e.value_pos + len(packed)] = packed
+    _check_value_type(e)
+    if e.count > _ARRAY_MIN_COUNT:
+        # A view over the bytearray is writable; assigning converts to the file's byte order in place
+        _values_view(endian, buf, e)[:] = vals
     else:
-        raise ValueError(f"Unsupported TIFF type {e.typ} for tag {e.tag}")
+        _values_struct(endian, e.typ, e.count).pack_into(buf, e.value_pos, *vals)
 
 
-def _gather_ifds(endian: str, data: bytes, ifd0_off: int) -> list[_Ifd]:
+def _iter_ifds(endian: str, data: bytes, ifd0_off: int) -> Iterator[_Ifd]:
+    """Yield IFDs as they are parsed; nothing past the consumer's stopping point is read."""
     seen = set()
     q = [ifd0_off]
-    out: list[_Ifd] = []
     while q:
         off = q.pop()
         if off == 0 or off in seen:
@@ -169,7 +189,7 @@ def _gather_ifds(endian: str, data: bytes, ifd0_off: int) -> list[_Ifd]:
         if off >= len(data):
             continue
         ifd = _parse_ifd(endian, data, off)
-        out.append(ifd)
+        yield ifd
         if ifd.next_ifd:
             q.append(ifd.next_ifd)
         sub = ifd.entries.get(TAG_SUBIFDS)
@@ -180,7 +200,6 @@ def _gather_ifds(endian: str, data: bytes, ifd0_off: int) -> list[_Ifd]:
                     q.append(so)
             except Exception:
                 pass
-    return out
 
 
 def _choose_main_tiled_ifd(endian: str, data: bytes, ifds: list[_Ifd]) -> _Ifd:
@@ -197,33 +216,149 @@ def _choose_main_tiled_ifd(endian: str, data: bytes, ifds: list[_Ifd]) -> _Ifd:
     return candidates[0][2]
 
 
-def _ppm_read_u16_rgb(path: str) -> np.ndarray:
-    with open(path, "rb") as f:
-        magic = f.readline().strip()
-        if magic != b"P6":
-            raise ValueError(f"Unexpected PPM magic: {magic}")
-        line = f.readline()
-        while line.startswith(b"#"):
-            line = f.readline()
-        w, h = map(int, line.split())
-        _ = int(f.readline().strip())  # maxval
-        raw = f.read()
-    return np.frombuffer(raw, dtype=">u2").reshape(h, w, 3).astype(np.uint16)
+def _find_main_tiled_ifd(endian: str, data: bytes, ifd0_off: int) -> _Ifd:
+    """Stop at the first tiled full-resolution IFD (NewSubFileType 0), else pick the largest tiled one."""
+    ifds = []
+    for ifd in _iter_ifds(endian, data, ifd0_off):
+        if TAG_TILE_OFFSETS in ifd.entries and TAG_TILE_BYTECOUNTS in ifd.entries:
+            subfile_type = ifd.entries.get(TAG_NEW_SUBFILE_TYPE)
+            if subfile_type is not None and _read_values(endian, data, subfile_type)[0] == 0:
+                return ifd
+        ifds.append(ifd)
+    return _choose_main_tiled_ifd(endian, data, ifds)
 
 
-def _ppm_write_u16_rgb(path: str, arr: np.ndarray) -> None:
-    h, w, c = arr.shape
-    assert c == 3
-    with open(path, "wb") as f:
-        f.write(f"P6\n{w} {h}\n65535\n".encode("ascii"))
-        f.write(arr.astype(">u2").tobytes())
+def _tool_threads(workers: int) -> int:
+    """libjxl worker threads per djxl/cjxl process so concurrent tiles don't oversubscribe the CPUs."""
+    # 0 runs the codec on the tool's main thread without starting a thread pool at all
+    threads = TILE_WORKERS // workers
+    return threads if threads > 1 else 0
 
 
-def _encode_tile_jxl(in_ppm: str, out_jxl: str, profile: JxlProfile) -> None:
+def _cjxl_command(in_ppm: str, out_jxl: str, profile: JxlProfile, num_threads: int = -1) -> list[str]:
+    """Build the cjxl command; in_ppm may be "-" to read the PPM from stdin."""
     cmd = ["cjxl", in_ppm, out_jxl, "-d", str(profile.distance), "-e", str(profile.effort)]
     if profile.modular:
         cmd.extend(["-m", "1"])
-    subprocess.run(cmd, capture_output=True, check=True)
+    cmd.extend(["--num_threads", str(num_threads)])
+    return cmd
+
+
+def _transcode_tile(i: int, tile_bytes: bytes, work_dir: str, profile: JxlProfile, num_threads: int = -1) -> bytes:
+    """Decode one JXL tile and re-encode it with the profile; files are named by tile index."""
+    out_jxl = os.path.join(work_dir, f"out_{i:03d}.jxl")
+
+    # djxl reads the tile on stdin and its 16-bit PPM streams straight into cjxl;
+    # the pixels are passed through unmodified, so nothing is written or parsed here
+    read_fd, write_fd = os.pipe()
+    try:
+        djxl = subprocess.Popen(
+            ["djxl", "-", "-", "--output_format", "ppm", "--bits_per_sample", "16", "--num_threads", str(num_threads)],
+            stdin=subprocess.PIPE,
+            stdout=write_fd,
+            stderr=subprocess.PIPE,
+        )
+        cmd = _cjxl_command("-", out_jxl, profile, num_threads)
+        try:
+            cjxl = subprocess.Popen(cmd, stdin=read_fd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except BaseException:
+            djxl.kill()
+            djxl.communicate()
+            raise
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    _, djxl_err = djxl.communicate(tile_bytes)
+    cjxl_out, cjxl_err = cjxl.communicate()
+    if djxl.returncode != 0:
+        raise RuntimeError(f"Failed to decode tile {i}: {djxl_err.decode()}")
+    if cjxl.returncode != 0:
+        raise subprocess.CalledProcessError(cjxl.returncode, cmd, cjxl_out, cjxl_err)
+
+    with open(out_jxl, "rb") as f:
+        return f.read()
+
+
+class _OrderedTileWriter:
+    """Append finished tiles to out in tile order, holding back only those that finish early."""
+
+    def __init__(self, out: BinaryIO, source: np.ndarray):
+        self.out = out
+        self.source = source  # tile whose stored data each tile shares (itself if unique)
+        self.offsets = np.zeros(len(source), dtype=np.int64)
+        self.counts = np.zeros(len(source), dtype=np.int64)
+        self.received = 0
+        self._ready: dict[int, bytes] = {}
+        self._next = 0
+
+    def add(self, i: int, data: bytes) -> None:
+        self.received += 1
+        self._ready[i] = data
+        while self._next < len(self.source):
+            i = self._next
+            src = self.source[i]
+            if src != i:
+                # Duplicate of an earlier tile, which is already written
+                self.offsets[i] = self.offsets[src]
+                self.counts[i] = self.counts[src]
+            elif i in self._ready:
+                data = self._ready.pop(i)
+                self.offsets[i] = self.out.tell()
+                self.counts[i] = len(data)
+                self.out.write(data)
+            else:
+                break
+            self._next += 1
+
+
+def _transcode_tiles(
+    orig: mmap.mmap,
+    tiles: np.ndarray,
+    tile_offsets: np.ndarray,
+    tile_counts: np.ndarray,
+    profile: JxlProfile,
+    writer: _OrderedTileWriter,
+    verbose: bool,
+    progress_callback: Callable[[int, int], None] | None,
+) -> None:
+    """Transcode the given tiles on a thread pool, handing each to writer as it finishes."""
+    workers = min(TILE_WORKERS, max(len(tiles), 1))
+    num_threads = _tool_threads(workers)
+    queue = iter(tiles)
+    in_flight = {}
+
+    with tempfile.TemporaryDirectory() as td, ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next() -> None:
+            # Tiles are sliced from the map only when submitted, so at most a window of them is in memory
+            for i in islice(queue, 1):
+                off, ln = tile_offsets[i], tile_counts[i]
+                in_flight[executor.submit(_transcode_tile, i, orig[off : off + ln], td, profile, num_threads)] = i
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        done = 0
+        try:
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    i = in_flight.pop(future)
+                    new_tile = future.result()
+                    done += 1
+                    writer.add(i, new_tile)
+
+                    if verbose:
+                        print(f"  Tile {i}: {int(tile_counts[i]) / 1024:.1f}KB → {len(new_tile) / 1024:.1f}KB")
+
+                    if progress_callback:
+                        progress_callback(done, len(tiles))
+
+                    submit_next()
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
 
 
 def compress_jxl_dng(
@@ -254,9 +389,6 @@ def compress_jxl_dng(
     """
     input_path = Path(input_path)
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"File not found: {input_path}")
-
     # Use default profile if not specified
     if profile is None:
         profile = JxlProfile()
@@ -267,19 +399,33 @@ def compress_jxl_dng(
     else:
         output_path = Path(output_path)
 
-    # Detect DNG type
+    # Detect DNG type (raises FileNotFoundError for a missing file)
     info = detect_dng(input_path)
 
     if info.compression != DngCompression.JXL:
         raise ValueError(
-            f"DNG is not JXL-compressed (found: {info.compression.value}). "
+            f"DNG is not JXL-compressed (found: {info.compression.name}). "
             "JXL recompression only works for iPhone 17+ JXL DNGs."
         )
 
-    # Read input DNG
+    # Map instead of read(): only the IFDs and tiles are touched, and they are sliced in place
     with open(input_path, "rb") as f:
-        orig = f.read()
+        orig = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return _recompress_tiles(orig, input_path, output_path, profile, verbose, progress_callback)
+    finally:
+        orig.close()
+
 
+def _recompress_tiles(
+    orig: mmap.mmap,
+    input_path: Path,
+    output_path: Path,
+    profile: JxlProfile,
+    verbose: bool,
+    progress_callback: Callable[[int, int], None] | None,
+) -> CompressionResult:
+    """Transcode the main image's tiles of the mapped DNG and write the rebuilt file."""
     # Detect endianness
     if orig[:2] == b"II":
         endian = "<"
@@ -299,94 +445,74 @@ def compress_jxl_dng(
 
     # Parse IFD structure
     ifd0_off = _read_u32(endian, orig, 4)
-    ifds = _gather_ifds(endian, orig, ifd0_off)
-    main_ifd = _choose_main_tiled_ifd(endian, orig, ifds)
+    main_ifd = _find_main_tiled_ifd(endian, orig, ifd0_off)
 
     # Get tile info
     tile_offsets_e = main_ifd.entries[TAG_TILE_OFFSETS]
     tile_counts_e = main_ifd.entries[TAG_TILE_BYTECOUNTS]
-    tile_offsets = _read_values(endian, orig, tile_offsets_e)
-    tile_counts = _read_values(endian, orig, tile_counts_e)
+    # Copies, not views: the map can only be closed once nothing references its buffer
+    tile_offsets = np.array(_read_values(endian, orig, tile_offsets_e))
+    tile_counts = np.array(_read_values(endian, orig, tile_counts_e))
     ntiles = len(tile_offsets)
 
-    first_tile = min(tile_offsets)
-
-    # Process tiles
-    new_tiles: list[bytes] = []
-    tile_stats: list[tuple[int, int]] = []
-
-    with tempfile.TemporaryDirectory() as td:
-        for i in range(ntiles):
-            off = tile_offsets[i]
-            ln = tile_counts[i]
-            tile_bytes = orig[off : off + ln]
-
-            in_jxl = os.path.join(td, f"in_{i:03d}.jxl")
-            dec_ppm = os.path.join(td, f"dec_{i:03d}.ppm")
-            out_jxl = os.path.join(td, f"out_{i:03d}.jxl")
-
-            # Write tile data
-            with open(in_jxl, "wb") as f:
-                f.write(tile_bytes)
-
-            # Decode with djxl
-            cmd = ["djxl", in_jxl, dec_ppm, "--bits_per_sample", "16"]
-            result = subprocess.run(cmd, capture_output=True)
-            if result.returncode != 0:
-                return CompressionResult(
-                    success=False,
-                    input_path=input_path,
-                    output_path=None,
-                    input_size=len(orig),
-                    output_size=0,
-                    tiles_processed=i,
-                    profile=profile,
-                    error_message=f"Failed to decode tile {i}: {result.stderr.decode()}",
-                )
-
-            # Read and re-encode
-            img = _ppm_read_u16_rgb(dec_ppm)
-            _ppm_write_u16_rgb(dec_ppm, img)  # Write back (no modifications)
-            _encode_tile_jxl(dec_ppm, out_jxl, profile)
-
-            with open(out_jxl, "rb") as f:
-                new_tile = f.read()
-                new_tiles.append(new_tile)
-                tile_stats.append((ln, len(new_tile)))
-
-            if verbose:
-                print(f"  Tile {i}: {ln / 1024:.1f}KB → {len(new_tile) / 1024:.1f}KB")
-
-            if progress_callback:
-                progress_callback(i + 1, ntiles)
-
-    # Build output DNG
-    out = bytearray(orig[:first_tile])
-
-    new_offsets = []
-    new_counts = []
-    for t in new_tiles:
-        new_offsets.append(len(out))
-        new_counts.append(len(t))
-        out.extend(t)
-
-    # Patch tile arrays
-    _write_values(endian, out, tile_offsets_e, new_offsets)
-    _write_values(endian, out, tile_counts_e, new_counts)
-
-    # Ensure output directory exists
+    first_tile = int(tile_offsets.min())
+
+    # Byte-identical tiles (flat sky, dark frames) are transcoded and stored once:
+    # source[i] is the tile whose output tile i shares, and TIFF allows shared offsets
+    source = np.arange(ntiles)
+    first_seen: dict[bytes, int] = {}
+    for i, (off, ln) in enumerate(zip(tile_offsets, tile_counts, strict=True)):
+        digest = hashlib.blake2b(orig[off : off + ln], digest_size=16).digest()
+        source[i] = first_seen.setdefault(digest, i)
+    unique = np.flatnonzero(source == np.arange(ntiles))
+
+    # The tile arrays live in the prefix; only the part up to their end is copied and patched
+    patch_end = max(e.value_pos + e.count * TIFF_TYPE_SIZE[e.typ] for e in (tile_offsets_e, tile_counts_e))
+    patch_end = min(patch_end, first_tile)
+
+    # Ensure output directory exists; the file only appears under its name once complete
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_output = output_path.with_name(f"{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_output, "wb") as out:
+            # Everything before the first tile is kept; new tiles are streamed after it in order
+            with memoryview(orig) as view:
+                out.write(view[:first_tile])
+            writer = _OrderedTileWriter(out, source)
+            _transcode_tiles(orig, unique, tile_offsets, tile_counts, profile, writer, verbose, progress_callback)
+            output_size = out.tell()
+
+            header = bytearray(orig[:patch_end])
+            _write_values(endian, header, tile_offsets_e, writer.offsets)
+            _write_values(endian, header, tile_counts_e, writer.counts)
+            out.seek(0)
+            out.write(header)
+    except RuntimeError as e:
+        # A tile failed to decode
+        tmp_output.unlink(missing_ok=True)
+        return CompressionResult(
+            success=False,
+            input_path=input_path,
+            output_path=None,
+            input_size=len(orig),
+            output_size=0,
+            tiles_processed=writer.received,
+            profile=profile,
+            error_message=str(e),
+        )
+    except BaseException:
+        tmp_output.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_output, output_path)
 
-    # Write output
-    with open(output_path, "wb") as f:
-        f.write(out)
+    tile_stats = [(int(ln), int(new_ln)) for ln, new_ln in zip(tile_counts, writer.counts, strict=True)]
 
     return CompressionResult(
         success=True,
         input_path=input_path,
         output_path=output_path,
         input_size=len(orig),
-        output_size=len(out),
+        output_size=output_size,
         tiles_processed=ntiles,
         profile=profile,
         tile_stats=tile_stats,
@@ -9,11 +9,14 @@ This is the recommended approach for LJPEG DNGs (iPhone 12-16) where
 JXL recompression doesn't work correctly.
 """
 
+import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-from .detector import detect_dng
+from .detector import DngInfo, detect_dng
 
 
 @dataclass
@@ -36,11 +39,123 @@ class ExtractionResult:
         return 0.0
 
 
+# JPEG start-of-image marker
+_JPEG_SOI = b"\xff\xd8"
+
+# Batch extraction mostly waits on exiftool and file I/O, so files run on threads
+PREVIEW_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+
+class ExifToolSession:
+    """
+    One `exiftool -stay_open` process reused for many commands.
+
+    exiftool's Perl startup dominates short commands; a batch pays it once.
+    The process is started on the first command, so a session that never
+    needs exiftool never spawns it.
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+        self._commands = 0
+
+    def __enter__(self) -> ExifToolSession:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def run(self, args: list[str]) -> bytes:
+        """Run one exiftool command (arguments without the program name) and return its stdout."""
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                ["exiftool", "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        self._commands += 1
+        # Numbered -execute makes exiftool end this command's output with a unique {readyN}
+        marker = f"{{ready{self._commands}}}\n".encode()
+        self._proc.stdin.write("".join(f"{arg}\n" for arg in [*args, f"-execute{self._commands}"]).encode())
+        self._proc.stdin.flush()
+
+        output = bytearray()
+        fd = self._proc.stdout.fileno()
+        while not output.endswith(marker):
+            chunk = os.read(fd, 1024 * 1024)
+            if not chunk:
+                raise RuntimeError("exiftool exited unexpectedly")
+            output += chunk
+        return bytes(output[: -len(marker)])
+
+    def close(self) -> None:
+        """Ask exiftool to exit and wait for it."""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.write(b"-stay_open\nFalse\n")
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        self._proc.wait()
+        self._proc.stdout.close()
+        self._proc = None
+
+
+def _run_exiftool(args: list[str], session: ExifToolSession | None) -> None:
+    """Run exiftool through session if given, else as its own process."""
+    if session is not None:
+        session.run(args)
+    else:
+        subprocess.run(["exiftool", *args], capture_output=True)
+
+
+def _copy_contiguous_preview(path: Path, offset: int, length: int, output_path: Path) -> bool:
+    """Copy the preview JPEG at offset into output_path; False if it isn't stored there as one JPEG."""
+    if not offset or not length:
+        return False
+    with open(path, "rb") as src:
+        in_fd = src.fileno()
+        if os.fstat(in_fd).st_size < offset + length or os.pread(in_fd, 2, offset) != _JPEG_SOI:
+            return False
+        with open(output_path, "wb") as dst:
+            out_fd = dst.fileno()
+            copied = 0
+            if hasattr(os, "sendfile"):
+                # In-kernel copy; platforms without file-to-file sendfile (e.g. macOS) fail on the first call
+                try:
+                    while copied < length and (sent := os.sendfile(out_fd, in_fd, offset + copied, length - copied)):
+                        copied += sent
+                except OSError:
+                    if copied:
+                        raise
+            if copied < length:
+                dst.write(os.pread(in_fd, length - copied, offset + copied))
+    return True
+
+
+def _extract_preview_exiftool(input_path: Path, output_path: Path, session: ExifToolSession | None) -> str | None:
+    """Write exiftool's -PreviewImage output to output_path; returns an error text on failure."""
+    args = ["-b", "-PreviewImage", str(input_path)]
+    with open(output_path, "wb") as f:
+        if session is not None:
+            f.write(session.run(args))
+            return None if f.tell() else ""
+        # exiftool writes the preview straight into the file, not through a Python buffer
+        result = subprocess.run(["exiftool", *args], stdout=f, stderr=subprocess.PIPE)
+        if result.returncode != 0 or not f.tell():
+            return result.stderr.decode()
+    return None
+
+
 def extract_preview(
     input_path: Path,
     output_path: Path | None = None,
     copy_metadata: bool = True,
     fix_orientation: bool = True,
+    info: DngInfo | None = None,
+    session: ExifToolSession | None = None,
 ) -> ExtractionResult:
     """
     Extract embedded Apple preview from DNG.
@@ -53,6 +168,8 @@ def extract_preview(
         output_path: Path for output JPEG (default: input_name.jpg in same dir)
         copy_metadata: Copy EXIF metadata from DNG to output
         fix_orientation: Apply orientation tag to pixel data
+        info: detect_dng result for input_path, if the caller already has it
+        session: exiftool session to run commands in (default: one process per command)
 
     Returns:
         ExtractionResult with extraction details
@@ -63,11 +180,10 @@ def extract_preview(
     """
     input_path = Path(input_path)
 
-    if not input_path.exists():
-        raise FileNotFoundError(f"File not found: {input_path}")
-
-    # Detect DNG info
-    info = detect_dng(input_path)
+    # Detect DNG info (the preview offset/length come from the IFD walk);
+    # detect_dng's stat raises FileNotFoundError for a missing file
+    if info is None:
+        info = detect_dng(input_path)
 
     if not info.has_preview:
         raise ValueError(f"DNG has no embedded preview: {input_path}")
@@ -81,50 +197,38 @@ def extract_preview(
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Extract preview using exiftool
-    cmd = ["exiftool", "-b", "-PreviewImage", str(input_path)]
-    result = subprocess.run(cmd, capture_output=True)
-
-    if result.returncode != 0 or not result.stdout:
-        return ExtractionResult(
-            success=False,
-            input_path=input_path,
-            output_path=None,
-            input_size=info.file_size,
-            output_size=0,
-            preview_dimensions=info.preview_dimensions,
-            error_message=f"Failed to extract preview: {result.stderr.decode()}",
-        )
-
-    # Write preview to file
-    with open(output_path, "wb") as f:
-        f.write(result.stdout)
+    # A contiguous preview is copied straight from the file; otherwise ask exiftool
+    if not _copy_contiguous_preview(input_path, info.preview_offset, info.preview_size, output_path):
+        error = _extract_preview_exiftool(input_path, output_path, session)
+
+        if error is not None:
+            output_path.unlink(missing_ok=True)
+            return ExtractionResult(
+                success=False,
+                input_path=input_path,
+                output_path=None,
+                input_size=info.file_size,
+                output_size=0,
+                preview_dimensions=info.preview_dimensions,
+                error_message=f"Failed to extract preview: {error}",
+            )
 
-    # Fix orientation - just update the tag, modern viewers handle it correctly
-    # (Pixel rotation would require JPEG re-encoding which degrades quality)
+    # Fix orientation and copy metadata from original DNG in one exiftool run.
+    # Orientation just updates the tag, modern viewers handle it correctly
+    # (Pixel rotation would require JPEG re-encoding which degrades quality);
+    # the copy comes last, as with separate runs, so the DNG's own Orientation is kept
+    args = ["-overwrite_original"]
     if fix_orientation:
-        cmd = [
-            "exiftool",
-            "-overwrite_original",
-            "-Orientation=1",
-            "-n",  # Use numeric value
-            str(output_path),
-        ]
-        subprocess.run(cmd, capture_output=True)
-
-    # Copy metadata from original DNG
+        args.append("-Orientation#=1")  # '#' = numeric value
     if copy_metadata:
-        cmd = [
-            "exiftool",
-            "-overwrite_original",
-            "-TagsFromFile",
-            str(input_path),
-            "-all:all",
-            str(output_path),
-        ]
-        subprocess.run(cmd, capture_output=True)
-
-    output_size = output_path.stat().st_size if output_path.exists() else 0
+        args += ["-TagsFromFile", str(input_path), "-all:all"]
+    if len(args) > 1:
+        _run_exiftool([*args, str(output_path)], session)
+
+    try:
+        output_size = output_path.stat().st_size
+    except OSError:
+        output_size = 0
 
     return ExtractionResult(
         success=True,
@@ -154,33 +258,57 @@ def batch_extract_previews(
     Returns:
         List of ExtractionResult for each input
     """
-    results = []
-
-    for input_path in input_paths:
+    # One exiftool session per worker thread, all closed once the batch is done
+    sessions: list[ExifToolSession] = []
+    local = threading.local()
+
+    def extract(input_path: Path) -> ExtractionResult:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = ExifToolSession()
+            sessions.append(session)
+        return _extract_one(input_path, output_dir, copy_metadata, fix_orientation, session)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(PREVIEW_WORKERS, max(len(input_paths), 1))) as executor:
+            return list(executor.map(extract, input_paths))
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def _extract_one(
+    input_path: Path,
+    output_dir: Path | None,
+    copy_metadata: bool,
+    fix_orientation: bool,
+    session: ExifToolSession,
+) -> ExtractionResult:
+    """extract_preview for one batch entry, turning any error into a failed result."""
+    try:
+        if output_dir:
+            output_path = output_dir / f"{input_path.stem}.jpg"
+        else:
+            output_path = None
+
+        return extract_preview(
+            input_path,
+            output_path=output_path,
+            copy_metadata=copy_metadata,
+            fix_orientation=fix_orientation,
+            session=session,
+        )
+    except Exception as e:
         try:
-            if output_dir:
-                output_path = output_dir / f"{input_path.stem}.jpg"
-            else:
-                output_path = None
-
-            result = extract_preview(
-                input_path,
-                output_path=output_path,
-                copy_metadata=copy_metadata,
-                fix_orientation=fix_orientation,
-            )
-            results.append(result)
-        except Exception as e:
-            results.append(
-                ExtractionResult(
-                    success=False,
-                    input_path=input_path,
-                    output_path=None,
-                    input_size=input_path.stat().st_size if input_path.exists() else 0,
-                    output_size=0,
-                    preview_dimensions=None,
-                    error_message=str(e),
-                )
-            )
-
-    return results
+            input_size = input_path.stat().st_size
+        except OSError:
+            input_size = 0
+        return ExtractionResult(
+            success=False,
+            input_path=input_path,
+            output_path=None,
+            input_size=input_size,
+            output_size=0,
+            preview_dimensions=None,
+            error_message=str(e),
+        )
@@ -4,6 +4,7 @@ DNG compression profiles.
 Configurable profiles for different DNG compression strategies.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
 
@@ -95,7 +96,7 @@ DEFAULT_PROFILES: dict[str, DngProfile] = {
 }
 
 
-def load_dng_profiles(yaml_cfg: dict) -> dict[str, DngProfile]:
+def load_dng_profiles(yaml_cfg: Mapping) -> dict[str, DngProfile]:
     """
     Load DNG profiles from YAML configuration.
 
@@ -140,7 +141,7 @@ def load_dng_profiles(yaml_cfg: dict) -> dict[str, DngProfile]:
     return profiles
 
 
-def get_default_profile_name(yaml_cfg: dict) -> str:
+def get_default_profile_name(yaml_cfg: Mapping) -> str:
     """Get default DNG profile name from config."""
     dng_config = yaml_cfg.get("dng", {})
     return dng_config.get("default_profile", "balanced")
@@ -88,8 +88,9 @@ def get_video_duration(video_path: Path) -> float:
         str(video_path),
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        return float(result.stdout.strip())
+        # Plain ASCII number: float() parses the bytes directly, no decode needed
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+        return float(result.stdout)
     except (subprocess.TimeoutExpired, ValueError):
         return 0.0
 
@@ -109,8 +110,8 @@ def get_video_resolution(video_path: Path) -> tuple[int, int]:
         str(video_path),
     ]
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        parts = result.stdout.strip().split(",")
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+        parts = result.stdout.split(b",")
         if len(parts) == 2:
             return int(parts[0]), int(parts[1])
     except (subprocess.TimeoutExpired, ValueError):
@@ -526,7 +527,10 @@ def run_pipeline(input_path: Path, output_dir: Path, config: EncoderProfile) ->
         copy_metadata(input_path, output_path)
 
         encode_time = time.time() - start_time
-        output_size = output_path.stat().st_size if output_path.exists() else 0
+        try:
+            output_size = output_path.stat().st_size
+        except OSError:
+            output_size = 0
 
         return PipelineResult(
             success=True,
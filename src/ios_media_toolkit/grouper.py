@@ -11,6 +11,7 @@ Detection uses cascade approach:
 """
 
 import json
+import os
 import subprocess
 from dataclasses import dataclass, field
 from enum import Enum
@@ -146,15 +147,17 @@ def group_album_files(album_path: Path) -> dict[str, MediaGroup]:
     # First pass: collect all files
     files_by_stem: dict[str, list[Path]] = {}
 
-    for file_path in album_path.iterdir():
-        if not file_path.is_file():
-            continue
+    # scandir entries carry the file type from readdir, so no stat per file
+    with os.scandir(album_path) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
 
-        stem = normalize_stem(file_path.name)
+            stem = normalize_stem(entry.name)
 
-        if stem not in files_by_stem:
-            files_by_stem[stem] = []
-        files_by_stem[stem].append(file_path)
+            if stem not in files_by_stem:
+                files_by_stem[stem] = []
+            files_by_stem[stem].append(Path(entry.path))
 
     # Second pass: create groups
     for stem, files in files_by_stem.items():
@@ -0,0 +1,60 @@
+"""
+Hashing module - Whole-file digests for checksums
+
+Reads through hashlib.file_digest so the hash runs in OpenSSL on a reused
+buffer, and hints the kernel that the file will be read front to back.
+"""
+
+import contextlib
+import hashlib
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# hashlib releases the GIL while hashing, so independent files hash in parallel on threads
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _advise_sequential(fd: int) -> None:
+    """Ask the kernel for aggressive read-ahead on fd (no-op where unsupported)."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    with contextlib.suppress(OSError):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def file_hexdigest(path: Path, algorithm: str = "sha256") -> str:
+    """
+    Compute the hex digest of a file.
+
+    Args:
+        path: File to hash
+        algorithm: Any hashlib algorithm name (e.g. 'sha256', 'md5')
+
+    Returns:
+        Hex digest string
+    """
+    with open(path, "rb") as f:
+        _advise_sequential(f.fileno())
+        return hashlib.file_digest(f, algorithm).hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    """Compute SHA256 checksum of a file."""
+    return file_hexdigest(path, "sha256")
+
+
+def sha256_many(paths: Iterable[Path]) -> list[str]:
+    """
+    Compute SHA256 checksums of several files concurrently.
+
+    Returns:
+        Hex digests in the same order as paths
+    """
+    paths = list(paths)
+    if len(paths) <= 1 or HASH_WORKERS <= 1:
+        return [sha256_file(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(paths))) as executor:
+        return list(executor.map(sha256_file, paths))
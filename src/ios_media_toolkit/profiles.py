@@ -9,6 +9,8 @@ Terminology:
 A profile defines HOW to encode, not WHAT to do.
 """
 
+from collections.abc import Mapping
+
 from .encoder import EncoderProfile, load_encoder_profile, resolve_tool_path
 
 # Re-export EncoderProfile as EncodingProfile for API compatibility
@@ -30,7 +32,7 @@ def load_profile(name: str, config_dict: dict, tools_config: dict) -> EncodingPr
     return load_encoder_profile(name, config_dict, tools_config)
 
 
-def load_profiles_from_yaml(yaml_cfg: dict) -> dict[str, EncodingProfile]:
+def load_profiles_from_yaml(yaml_cfg: Mapping) -> dict[str, EncodingProfile]:
     """
     Load all profiles from YAML configuration.
 
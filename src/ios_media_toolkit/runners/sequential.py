@@ -1,9 +1,10 @@
 """Sequential runner - Executes workflows tasks one at a time."""
 
+import os
 import shutil
 from pathlib import Path
 
-from ..actions import classify_favorites, scan_folder
+from ..actions import classify_favorites, scan_and_classify
 from ..actions.scan import is_mov_file
 from ..constants import DNG_EXTENSIONS, FAV_SUFFIX
 from ..dng import DngMethod, compress_jxl_dng, extract_preview
@@ -182,7 +183,12 @@ class SequentialRunner:
     def _run_scan(self, workflow: ArchiveWorkflow, cb: RunnerCallbacks) -> bool:
         """Execute scan task."""
         config = workflow.config
-        scan_result = scan_folder(config.source)
+        scan_result = config.scan_result
+        if scan_result is None:
+            # One directory walk for both tasks; the classify task picks up the favorites from it
+            scan_result, classify_result = scan_and_classify(config.source, config.rating_threshold)
+            if config.classify_result is None:
+                config.classify_result = classify_result
 
         if not scan_result.success:
             return False
@@ -190,20 +196,32 @@ class SequentialRunner:
         # Get already processed files from manifest
         processed_stems = self.manifest.get_processed_stems() if self.manifest else set()
 
+        # Names already in the output folder, read once instead of exists() per candidate
+        existing: set[str] = set()
+        if not config.force and config.output.is_dir():
+            with os.scandir(config.output) as entries:
+                existing = {e.name for e in entries if e.is_file()}
+
         # Categorize videos
         min_size_bytes = config.min_size_mb * 1024 * 1024
 
-        for video in scan_result.videos:
+        # Sizes recorded by the scan walk; stat only when a result arrives without them
+        video_sizes = scan_result.video_sizes
+
+        for idx, video in enumerate(scan_result.videos):
             is_mov = is_mov_file(video)
-            output_file = config.output / f"{video.stem}.mp4"
-            output_file_fav = config.output / f"{video.stem}{FAV_SUFFIX}.mp4"
+            stem = video.stem
 
             # Skip if output exists and not force
-            if not config.force and (output_file.exists() or output_file_fav.exists()):
+            if f"{stem}.mp4" in existing or f"{stem}{FAV_SUFFIX}.mp4" in existing:
                 continue
 
             # Non-MOV files: copy (already compressed)
-            if not is_mov or (min_size_bytes > 0 and video.stat().st_size < min_size_bytes):
+            too_small = (
+                min_size_bytes > 0
+                and (video_sizes[idx] if video_sizes is not None else video.stat().st_size) < min_size_bytes
+            )
+            if not is_mov or too_small:
                 workflow.videos_to_copy.append(video)
             # MOV files: transcode
             else:
@@ -216,21 +234,19 @@ class SequentialRunner:
         # Filter photos by processed status AND output file existence
         # Separate DNGs from regular photos
         for photo in scan_result.photos:
+            stem = photo.stem
+            suffix = os.path.splitext(photo)[1]
+            is_dng = suffix.lower() in DNG_EXTENSIONS
             # Skip if in manifest (unless force)
-            if photo.stem in processed_stems and not config.force:
+            if stem in processed_stems and not config.force:
                 # But check if output actually exists - if not, process anyway
                 # For DNGs, output will be .jpg; for others, same extension
-                if photo.suffix in DNG_EXTENSIONS:
-                    output_file = config.output / f"{photo.stem}.jpg"
-                    output_file_fav = config.output / f"{photo.stem}{FAV_SUFFIX}.jpg"
-                else:
-                    output_file = config.output / f"{photo.stem}{photo.suffix}"
-                    output_file_fav = config.output / f"{photo.stem}{FAV_SUFFIX}{photo.suffix}"
-                if output_file.exists() or output_file_fav.exists():
+                out_suffix = ".jpg" if is_dng else suffix
+                if f"{stem}{out_suffix}" in existing or f"{stem}{FAV_SUFFIX}{out_suffix}" in existing:
                     continue
 
             # Separate DNGs from regular photos
-            if photo.suffix in DNG_EXTENSIONS:
+            if is_dng:
                 workflow.dngs_to_process.append(photo)
             else:
                 workflow.photos_to_copy.append(photo)
@@ -248,7 +264,9 @@ class SequentialRunner:
     def _run_classify(self, workflow: ArchiveWorkflow, _cb: RunnerCallbacks) -> bool:
         """Execute classify task."""
         config = workflow.config
-        classify_result = classify_favorites(config.source, config.rating_threshold)
+        classify_result = config.classify_result
+        if classify_result is None:
+            classify_result = classify_favorites(config.source, config.rating_threshold)
 
         if classify_result.success:
             workflow.favorites = classify_result.favorites
@@ -299,14 +317,15 @@ class SequentialRunner:
             if cb.on_copy_progress and (copied % progress_interval == 0 or copied == total):
                 cb.on_copy_progress(file_type, copied, total)
 
-            # Track in manifest
+            # Track in manifest; a copy is byte-identical, so one stat covers both sizes
             if self.manifest:
+                size = file_path.stat().st_size
                 self.manifest.mark_completed(
                     stem=file_path.stem,
                     source_path=file_path,
                     output_path=output_file,
-                    input_size=file_path.stat().st_size,
-                    output_size=output_file.stat().st_size,
+                    input_size=size,
+                    output_size=size,
                     is_favorite=is_favorite,
                 )
 
@@ -2,12 +2,14 @@
 File discovery and classification for album scanning.
 """
 
-import hashlib
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
+from .hashing import file_hexdigest
+
 
 class FileType(Enum):
     PHOTO_HEIC = "heic"
@@ -84,9 +86,10 @@ class MediaFile:
     error: str | None = None
 
     @classmethod
-    def from_path(cls, path: Path, compute_checksum: bool = False) -> MediaFile:
-        """Create MediaFile from a file path."""
-        stat = path.stat()
+    def from_path(cls, path: Path, compute_checksum: bool = False, stat: os.stat_result | None = None) -> MediaFile:
+        """Create MediaFile from a file path, reusing stat if the caller already has it."""
+        if stat is None:
+            stat = path.stat()
         stem = path.stem
         extension = path.suffix.lower().lstrip(".")
 
@@ -110,13 +113,9 @@ class MediaFile:
 
         return media_file
 
-    def compute_checksum(self, chunk_size: int = 8192) -> str:
+    def compute_checksum(self) -> str:
         """Compute MD5 checksum of the file."""
-        md5 = hashlib.md5()
-        with open(self.path, "rb") as f:
-            while chunk := f.read(chunk_size):
-                md5.update(chunk)
-        return md5.hexdigest()
+        return file_hexdigest(self.path, "md5")
 
     @property
     def is_media(self) -> bool:
@@ -196,10 +195,13 @@ class AlbumScanner:
             source_path=album_path,
         )
 
-        # Scan all files
-        for file_path in album_path.iterdir():
-            if file_path.is_file() and not file_path.name.startswith("."):
-                media_file = MediaFile.from_path(file_path, compute_checksum=self.compute_checksums)
+        # Scan all files; DirEntry carries the file type and caches its stat
+        with os.scandir(album_path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                file_path = album_path / entry.name
+                media_file = MediaFile.from_path(file_path, compute_checksum=self.compute_checksums, stat=entry.stat())
                 album.files.append(media_file)
 
                 # Track sidecars by normalized stem
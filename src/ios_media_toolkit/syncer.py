@@ -8,7 +8,6 @@ Handles:
 - Smart sync: skip identical files already in destination
 """
 
-import hashlib
 import logging
 import os
 import shutil
@@ -18,17 +17,17 @@ from pathlib import Path
 from .classifier import is_favorite
 from .config import AppConfig
 from .grouper import group_album_files
+from .hashing import sha256_file, sha256_many
 
 logger = logging.getLogger(__name__)
 
+# Above this size, source and destination are hashed concurrently when comparing
+PARALLEL_HASH_MIN_SIZE = 4 * 1024 * 1024
 
-def file_checksum(path: Path, chunk_size: int = 8192) -> str:
+
+def file_checksum(path: Path) -> str:
     """Compute SHA256 checksum of a file."""
-    sha256 = hashlib.sha256()
-    with open(path, "rb") as f:
-        while chunk := f.read(chunk_size):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+    return sha256_file(path)
 
 
 def files_are_identical(src: Path, dst: Path, use_checksum: bool = True) -> bool:
@@ -50,6 +49,9 @@ def files_are_identical(src: Path, dst: Path, use_checksum: bool = True) -> bool
 
     # Same size - use checksum for definitive check
     if use_checksum:
+        if src_stat.st_size >= PARALLEL_HASH_MIN_SIZE:
+            src_sum, dst_sum = sha256_many((src, dst))
+            return src_sum == dst_sum
         return file_checksum(src) == file_checksum(dst)
 
     # Fast mode: same size = assume identical
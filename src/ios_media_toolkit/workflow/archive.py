@@ -12,6 +12,8 @@ This is the main workflow for processing iPhone media:
 from dataclasses import dataclass, field
 from pathlib import Path
 
+from ..actions.classify import ClassifyResult
+from ..actions.scan import ScanResult
 from ..dng import DngProfile
 from ..profiles import EncodingProfile
 from .tasks import Task, TaskType, Workflow
@@ -30,6 +32,9 @@ class ArchiveWorkflowConfig:
     limit: int = 0  # 0 = unlimited
     min_size_mb: int = 0  # Minimum size to transcode
     rating_threshold: int = 5
+    # Precomputed results for the source folder; runners reuse these instead of rescanning
+    scan_result: ScanResult | None = None
+    classify_result: ClassifyResult | None = None
 
 
 @dataclass
@@ -59,6 +64,8 @@ def create_archive_workflow(
     limit: int = 0,
     min_size_mb: int = 0,
     rating_threshold: int = 5,
+    scan_result: ScanResult | None = None,
+    classify_result: ClassifyResult | None = None,
 ) -> ArchiveWorkflow:
     """
     Create an archive workflow for processing media.
@@ -76,6 +83,8 @@ def create_archive_workflow(
         limit: Maximum videos to transcode (0 = unlimited)
         min_size_mb: Minimum file size in MB to transcode
         rating_threshold: XMP rating threshold for favorites
+        scan_result: Scan of source already done by the caller (skips the scan walk)
+        classify_result: Favorites classification of source already done by the caller
 
     Returns:
         ArchiveWorkflow ready for execution by a runner
@@ -90,6 +99,8 @@ def create_archive_workflow(
         limit=limit,
         min_size_mb=min_size_mb,
         rating_threshold=rating_threshold,
+        scan_result=scan_result,
+        classify_result=classify_result,
     )
 
     workflow = ArchiveWorkflow(
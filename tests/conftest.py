@@ -1,6 +1,7 @@
 """Shared pytest fixtures for ios-media-toolkit tests."""
 
 import re
+import struct
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -35,6 +36,67 @@ class AnsiStrippingCliRunner(CliRunner):
         return StrippedResult(result)
 
 
+def minimal_tiff_header(compression: int = 7, big_endian: bool = False, width: int = 0, height: int = 0) -> bytes:
+    """Create a minimal valid TIFF header with compression (and optional size) tags."""
+    entries = [(259, 3, [compression])]
+    if width and height:
+        entries = [(256, 4, [width]), (257, 4, [height]), *entries]
+    return build_tiff(entries, big_endian=big_endian)
+
+
+def build_tiff(
+    ifd0: list[tuple[int, int, list[int]]],
+    sub_ifds: list[list[tuple[int, int, list[int]]]] = (),
+    big_endian: bool = False,
+) -> bytes:
+    """Build a TIFF with IFD0 and optional SubIFDs from (tag, type, values) entries."""
+    e = ">" if big_endian else "<"
+    codes = {3: "H", 4: "I"}
+    if sub_ifds:
+        ifd0 = [*ifd0, (330, 4, [0] * len(sub_ifds))]  # offsets patched below
+    ifds = [ifd0, *sub_ifds]
+
+    # IFDs back to back after the 8-byte header, overflow values after them
+    offsets = []
+    pos = 8
+    for entries in ifds:
+        offsets.append(pos)
+        pos += 2 + 12 * len(entries) + 4
+    if sub_ifds:
+        ifd0[-1] = (330, 4, offsets[1:])
+
+    body = bytearray()
+    extra = bytearray()
+    for entries in ifds:
+        body.extend(struct.pack(f"{e}H", len(entries)))
+        for tag, typ, values in sorted(entries):
+            raw = struct.pack(f"{e}{len(values)}{codes[typ]}", *values)
+            body.extend(struct.pack(f"{e}HHI", tag, typ, len(values)))
+            if len(raw) <= 4:
+                body.extend(raw.ljust(4, b"\0"))
+            else:
+                body.extend(struct.pack(f"{e}I", pos + len(extra)))
+                extra.extend(raw)
+        body.extend(struct.pack(f"{e}I", 0))  # Next IFD offset
+
+    header = (b"MM" if big_endian else b"II") + struct.pack(f"{e}HI", 42, 8)
+    return header + bytes(body) + bytes(extra)
+
+
+@pytest.fixture(autouse=True)
+def isolated_dng_cache():
+    """Give each test an empty detect_dng cache."""
+    from ios_media_toolkit.dng import detector
+
+    detector._parse_tiff_cached.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_xdg_cache(tmp_path_factory, monkeypatch):
+    """Keep the parsed-config cache out of the user's cache dir and per-test."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("xdg_cache")))
+
+
 @pytest.fixture
 def cli_runner():
     """Typer CLI test runner with ANSI codes stripped."""
@@ -3,8 +3,11 @@
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from ios_media_toolkit.actions.classify import ClassifyResult, classify_favorites, is_favorite
 from ios_media_toolkit.actions.copy import CopyResult, copy_files, copy_photos
+from ios_media_toolkit.actions.pipeline import scan_and_classify
 from ios_media_toolkit.actions.scan import ScanResult, is_mov_file, scan_folder
 from ios_media_toolkit.actions.transcode import TranscodeResult
 from ios_media_toolkit.actions.verify import VerifyResult, verify_dv_compatibility
@@ -31,6 +34,18 @@ class TestScanResult:
         result = ScanResult(success=True, videos=[video], photos=[photo])
         assert result.total_size_bytes == 150
 
+    def test_total_size_bytes_uses_scanned_sizes(self, tmp_path):
+        """Test sizes captured by scan_folder are used without re-stat."""
+        (tmp_path / "video.mov").write_bytes(b"x" * 100)
+        (tmp_path / "photo.heic").write_bytes(b"y" * 50)
+
+        result = scan_folder(tmp_path)
+        assert result.video_sizes == [100]
+        assert result.photo_sizes == [50]
+
+        (tmp_path / "video.mov").unlink()
+        assert result.total_size_bytes == 150
+
 
 class TestScanFolder:
     """Tests for scan_folder function."""
@@ -55,6 +70,16 @@ class TestScanFolder:
         assert len(result.videos) == 2
         assert len(result.photos) == 1
 
+    def test_scan_folder_mixed_case_extensions(self, tmp_path):
+        """Test extensions are matched case-insensitively and directories skipped."""
+        (tmp_path / "clip.Mov").touch()
+        (tmp_path / "photo.Heic").touch()
+        (tmp_path / "album.jpg").mkdir()
+
+        result = scan_folder(tmp_path)
+        assert [p.name for p in result.videos] == ["clip.Mov"]
+        assert [p.name for p in result.photos] == ["photo.Heic"]
+
     def test_scan_nonexistent_folder(self):
         """Test scanning nonexistent folder."""
         result = scan_folder(Path("/nonexistent/path"))
@@ -79,6 +104,10 @@ class TestIsMovFile:
         assert is_mov_file(Path("video.mov"))
         assert is_mov_file(Path("VIDEO.MOV"))
 
+    def test_mixed_case_mov_extension(self):
+        """Test MOV detection ignores extension case."""
+        assert is_mov_file(Path("video.Mov"))
+
     def test_non_mov_video(self):
         """Test non-MOV video files."""
         assert not is_mov_file(Path("video.mp4"))
@@ -284,6 +313,39 @@ class TestCopyFiles:
         # Content overwritten
         assert dst.read_text() == "new content"
 
+    def test_copy_files_preserves_mtime_and_counts_bytes(self, tmp_path):
+        """Test copied files keep source mtime and bytes are counted."""
+        import os
+
+        src = tmp_path / "clip.mov"
+        src.write_bytes(b"z" * 4096)
+        os.utime(src, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+        output = tmp_path / "output"
+
+        result = copy_files([src], output)
+
+        dst = output / "clip.mov"
+        assert result.bytes_copied == 4096
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime_ns == src.stat().st_mtime_ns
+
+    def test_copy_files_many_files(self, tmp_path):
+        """Test copying more files than worker threads."""
+        source = tmp_path / "source"
+        source.mkdir()
+        files = []
+        for i in range(20):
+            f = source / f"IMG_{i:04d}.HEIC"
+            f.write_bytes(bytes([i]) * (i + 1))
+            files.append(f)
+        output = tmp_path / "output"
+
+        result = copy_files(files, output)
+
+        assert result.files_copied == 20
+        assert result.bytes_copied == sum(range(1, 21))
+        assert all((output / f.name).read_bytes() == f.read_bytes() for f in files)
+
     def test_copy_files_empty_list(self, tmp_path):
         """Test copying empty file list."""
         output = tmp_path / "output"
@@ -473,3 +535,53 @@ class TestVerifyDvCompatibility:
 
         assert not result.success
         assert "File not found" in result.error
+
+
+class TestLazyExports:
+    """Tests for lazy attribute loading in the actions package."""
+
+    def test_all_exports_resolve(self):
+        """Test every name in __all__ resolves to the submodule's object."""
+        import ios_media_toolkit.actions as actions
+        from ios_media_toolkit.actions import scan
+
+        for name in actions.__all__:
+            assert getattr(actions, name) is not None
+        assert actions.scan_folder is scan.scan_folder
+
+    def test_unknown_attribute_raises(self):
+        """Test unknown names raise AttributeError."""
+        import ios_media_toolkit.actions as actions
+
+        with pytest.raises(AttributeError):
+            _ = actions.not_an_action
+
+
+class TestScanAndClassify:
+    """Tests for the fused scan_and_classify action."""
+
+    def test_matches_separate_actions(self, tmp_path):
+        """Test fused results match scan_folder plus classify_favorites."""
+        (tmp_path / "IMG_0001.HEIC").write_bytes(b"a" * 10)
+        (tmp_path / "IMG_0001.HEIC.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+        (tmp_path / "IMG_0002.MOV").write_bytes(b"b" * 20)
+        (tmp_path / "IMG_0003.DNG").write_bytes(b"c" * 5)
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        scan_result, classify_result = scan_and_classify(tmp_path)
+
+        separate_scan = scan_folder(tmp_path)
+        separate_classify = classify_favorites(tmp_path)
+        assert sorted(scan_result.videos) == sorted(separate_scan.videos)
+        assert sorted(scan_result.photos) == sorted(separate_scan.photos)
+        assert scan_result.total_size_bytes == 35
+        assert classify_result.favorites == separate_classify.favorites == {"IMG_0001"}
+        assert classify_result.total_classified == separate_classify.total_classified
+
+    def test_missing_folder(self):
+        """Test both results fail for a missing folder."""
+        scan_result, classify_result = scan_and_classify(Path("/nonexistent/path"))
+
+        assert not scan_result.success
+        assert not classify_result.success
+        assert "not found" in scan_result.error.lower()
@@ -1,5 +1,7 @@
 """Tests for favorites classification from XMP metadata."""
 
+from unittest.mock import patch
+
 from ios_media_toolkit.classifier import (
     classify_album,
     find_xmp_sidecar,
@@ -181,6 +183,46 @@ class TestIsFavorite:
 
         assert result.is_favorite is False
 
+    def test_non_utf8_sidecar_still_parsed(self, tmp_path):
+        """Test rating is found even when the sidecar is not valid UTF-8."""
+        photo = tmp_path / "photo.HEIC"
+        photo.write_bytes(b"x")
+        xmp = tmp_path / "photo.HEIC.xmp"
+        xmp.write_bytes(b"\xff\xfe<xmp:Rating>5</xmp:Rating>")
+
+        result = is_favorite(photo)
+
+        assert result.is_favorite is True
+        assert result.source == "xmp"
+
+    def test_rating_after_unrelated_rating_tag(self, tmp_path):
+        """Test the rating is found when another *Rating tag appears first."""
+        photo = tmp_path / "photo.HEIC"
+        photo.write_bytes(b"x")
+        xmp = tmp_path / "photo.HEIC.xmp"
+        xmp.write_text('<x MicrosoftPhoto:Rating="99"/>\n<xmp:Rating>5</xmp:Rating>')
+
+        result = is_favorite(photo)
+
+        assert result.rating == 5
+        assert result.source == "xmp"
+
+    def test_edited_sidecar_is_reparsed(self, tmp_path):
+        """Test cached ratings are invalidated when the sidecar changes."""
+        import os
+
+        photo = tmp_path / "photo.HEIC"
+        photo.write_bytes(b"x")
+        xmp = tmp_path / "photo.HEIC.xmp"
+        xmp.write_text("<xmp:Rating>5</xmp:Rating>")
+        assert is_favorite(photo).is_favorite is True
+
+        xmp.write_text("<xmp:Rating>1</xmp:Rating>")
+        st = xmp.stat()
+        os.utime(xmp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert is_favorite(photo).rating == 1
+
 
 class TestClassifyAlbum:
     """Tests for classify_album function."""
@@ -234,6 +276,54 @@ class TestClassifyAlbum:
 
         assert results == {}
 
+    def test_classify_album_without_sidecars(self, tmp_path):
+        """Test albums with no XMP files classify every file as not favorite."""
+        album = tmp_path / "album"
+        album.mkdir()
+        (album / "IMG_0001.HEIC").write_bytes(b"x")
+        (album / "IMG_0002.MOV").write_bytes(b"x")
+
+        results = classify_album(album)
+
+        assert len(results) == 2
+        assert all(info.source == "none" and info.xmp_path is None for info in results.values())
+
+    def test_small_album_classified_without_pool(self, tmp_path):
+        """Test a few sidecar reads are done inline instead of starting a thread pool."""
+        album = tmp_path / "album"
+        album.mkdir()
+        (album / "fav.HEIC").write_bytes(b"x")
+        (album / "fav.HEIC.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+        (album / "plain.HEIC").write_bytes(b"x")
+
+        with patch("ios_media_toolkit.classifier.ThreadPoolExecutor") as pool:
+            results = classify_album(album)
+
+        pool.assert_not_called()
+        assert results[album / "fav.HEIC"].is_favorite
+        assert not results[album / "plain.HEIC"].is_favorite
+
+    def test_pool_capped_at_sidecar_reads(self, tmp_path):
+        """Test the pool gets no more workers than there are sidecars to read."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from ios_media_toolkit.classifier import CLASSIFY_PARALLEL_MIN
+
+        album = tmp_path / "album"
+        album.mkdir()
+        for i in range(CLASSIFY_PARALLEL_MIN):
+            (album / f"IMG_{i}.HEIC").write_bytes(b"x")
+            (album / f"IMG_{i}.HEIC.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+        for i in range(20):
+            (album / f"plain_{i}.HEIC").write_bytes(b"x")
+
+        with patch("ios_media_toolkit.classifier.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+            results = classify_album(album)
+
+        assert pool.call_args.kwargs["max_workers"] <= CLASSIFY_PARALLEL_MIN
+        assert sum(info.is_favorite for info in results.values()) == CLASSIFY_PARALLEL_MIN
+        assert len(results) == CLASSIFY_PARALLEL_MIN + 20
+
 
 class TestGetFavorites:
     """Tests for get_favorites function."""
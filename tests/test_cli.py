@@ -1,6 +1,17 @@
 """Tests for CLI commands using Typer's CliRunner."""
 
-from ios_media_toolkit.cli import app
+import re
+from unittest.mock import patch
+
+import pytest
+
+from ios_media_toolkit.cli import (
+    _load_config_profiles,
+    _load_yaml_config,
+    _parse_yaml_config,
+    app,
+    format_size_change,
+)
 
 
 class TestCLIBasics:
@@ -12,6 +23,21 @@ class TestCLIBasics:
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
+    def test_entry_point_version_skips_cli_import(self):
+        """Test the imt entry point answers --version without importing typer."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys; sys.argv = ['imt', '--version']\n"
+            "from ios_media_toolkit.__main__ import main\n"
+            "main()\n"
+            "print('typer' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.splitlines() == ["imt version 0.1.0", "False"]
+
     def test_help_option(self, cli_runner):
         """Test --help displays help."""
         result = cli_runner.invoke(app, ["--help"])
@@ -40,6 +66,70 @@ class TestListProfilesCommand:
         assert result.exit_code == 0
         assert "balanced" in result.output
 
+    def test_list_profiles_empty_config(self, cli_runner, tmp_path):
+        """Test list-profiles reports an empty config instead of an empty table."""
+        cfg = tmp_path / "empty.yaml"
+        cfg.write_text("video: {}\n")
+
+        result = cli_runner.invoke(app, ["list-profiles", "--config", str(cfg)])
+
+        assert result.exit_code == 0
+        assert "No profiles defined in config" in result.output
+
+
+class TestScanCommand:
+    """Tests for scan command."""
+
+    def test_scan_lists_subfolders(self, cli_runner, tmp_path):
+        """Test scan shows each visible subfolder with its file count."""
+        for name, count in (("Album A", 2), ("Album B", 3)):
+            album = tmp_path / name
+            album.mkdir()
+            for i in range(count):
+                (album / f"IMG_{i}.HEIC").write_bytes(b"x" * 10)
+        (tmp_path / ".hidden").mkdir()
+
+        result = cli_runner.invoke(app, ["scan", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "Album A" in result.output
+        assert "Album B" in result.output
+        assert ".hidden" not in result.output
+
+    def test_scan_no_subfolders(self, cli_runner, tmp_path):
+        """Test scan reports when there is nothing to list."""
+        result = cli_runner.invoke(app, ["scan", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "No subfolders found" in result.output
+
+    def test_scan_ignores_top_level_files(self, cli_runner, tmp_path):
+        """Test files directly in the scanned folder are not listed as subfolders."""
+        (tmp_path / "IMG_0001.HEIC").touch()
+
+        result = cli_runner.invoke(app, ["scan", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "No subfolders found" in result.output
+
+
+class TestStatusCommand:
+    """Tests for status command."""
+
+    def test_status_counts(self, cli_runner, tmp_path):
+        """Test status reports photo and video counts."""
+        (tmp_path / "IMG_0001.HEIC").write_bytes(b"x")
+        (tmp_path / "IMG_0002.JPG").write_bytes(b"x")
+        (tmp_path / "IMG_0003.MOV").write_bytes(b"x")
+        (tmp_path / "IMG_0001.HEIC.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+
+        result = cli_runner.invoke(app, ["status", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert re.search(r"Photos\s*│\s*2\b", result.output)
+        assert re.search(r"Videos\s*│\s*1\b", result.output)
+        assert re.search(r"Total Files\s*│\s*4\b", result.output)
+
 
 class TestProcessCommand:
     """Tests for process command."""
@@ -58,6 +148,89 @@ class TestProcessCommand:
         assert "--output" in result.output
         assert "--dry-run" in result.output
 
+    def test_process_dry_run_lists_files(self, cli_runner, tmp_path):
+        """Test dry run lists each file with its planned action."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "clip.MOV").write_bytes(b"x" * 100)
+        (source / "other.mp4").write_bytes(b"x" * 100)
+        (source / "photo.heic").touch()
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(tmp_path / "out"), "--dry-run"])
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert "  TRANSCODE: clip.MOV" in lines
+        assert "  COPY (not MOV): other.mp4 (0.0MB)" in lines
+        assert "  COPY: photo.heic (0.0MB)" in lines
+        assert "Videos to transcode: 1" in result.output
+
+    def test_process_dry_run_prints_names_verbatim(self, cli_runner, tmp_path):
+        """Test file names that look like markup are printed as-is."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "[red]clip.MOV").write_bytes(b"x" * 100)
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(tmp_path / "out"), "--dry-run"])
+
+        assert result.exit_code == 0
+        assert "  TRANSCODE: [red]clip.MOV" in result.output.splitlines()
+
+    def test_process_dry_run_skips_existing_outputs(self, cli_runner, tmp_path):
+        """Test dry run skips videos whose output already exists unless forced."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "clip.MOV").write_bytes(b"x" * 100)
+        output = tmp_path / "out"
+        output.mkdir()
+        (output / "clip.mp4").touch()
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(output), "--dry-run"])
+        assert "  SKIP (exists): clip.MOV" in result.output.splitlines()
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(output), "--dry-run", "--force"])
+        assert "  TRANSCODE: clip.MOV" in result.output.splitlines()
+
+    def test_process_dry_run_reports_scanned_sizes(self, cli_runner, tmp_path):
+        """Test dry run sizes come from the scan and match the files."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "clip.mp4").write_bytes(b"x" * (3 * 1024 * 1024 // 2))
+        (source / "photo.jpg").write_bytes(b"x" * (1024 * 1024 // 2))
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(tmp_path / "out"), "--dry-run"])
+
+        lines = result.output.splitlines()
+        assert "  COPY (not MOV): clip.mp4 (1.5MB)" in lines
+        assert "  COPY: photo.jpg (0.5MB)" in lines
+
+    def test_process_dry_run_counts_video_favorites(self, cli_runner, tmp_path):
+        """Test favorites are counted across videos and photos in the summary."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "clip.MOV").write_bytes(b"x" * 100)
+        (source / "clip.MOV.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+        (source / "photo.heic").touch()
+
+        result = cli_runner.invoke(app, ["process", str(source), "-o", str(tmp_path / "out"), "--dry-run"])
+
+        assert "  TRANSCODE: clip.MOV ★" in result.output.splitlines()
+        assert "Favorites detected:  1" in result.output
+
+    def test_process_dry_run_min_size(self, cli_runner, tmp_path):
+        """Test dry run copies MOVs under --min-size instead of transcoding."""
+        source = tmp_path / "album"
+        source.mkdir()
+        (source / "small.MOV").write_bytes(b"x" * 100)
+
+        result = cli_runner.invoke(
+            app, ["process", str(source), "-o", str(tmp_path / "out"), "--dry-run", "--min-size", "1"]
+        )
+
+        assert result.exit_code == 0
+        assert "  COPY (<1MB): small.MOV (0.0MB)" in result.output.splitlines()
+        assert "Videos to transcode: 0" in result.output
+
 
 class TestTranscodeCommand:
     """Tests for transcode command."""
@@ -77,6 +250,60 @@ class TestTranscodeCommand:
         assert "--overwrite" in result.output
 
 
+class TestCompareCommand:
+    """Tests for compare command."""
+
+    def test_compare_parallel_jobs_use_separate_outputs(self, cli_runner, tmp_path):
+        """Test --jobs runs profiles concurrently, each into its own subfolder, reported in order."""
+        from ios_media_toolkit.encoder import PipelineResult
+
+        video = tmp_path / "clip.MOV"
+        video.write_bytes(b"x" * 1000)
+        out_dirs = []
+
+        def fake_run_pipeline(input_path, output_dir, config):
+            out_dirs.append(output_dir)
+            return PipelineResult(
+                success=True,
+                input_path=input_path,
+                output_path=output_dir / "clip.mp4",
+                pipeline_name=config.name,
+                input_size=1000,
+                output_size=500,
+            )
+
+        with patch("ios_media_toolkit.encoder.run_pipeline", side_effect=fake_run_pipeline):
+            result = cli_runner.invoke(
+                app, ["compare", str(video), "-o", str(tmp_path / "cmp"), "-p", "archival", "-p", "compact", "-j", "2"]
+            )
+
+        assert result.exit_code == 0
+        assert sorted(out_dirs) == [tmp_path / "cmp" / "archival", tmp_path / "cmp" / "compact"]
+        assert result.output.index("✓ archival:") < result.output.index("✓ compact:")
+
+    def test_compare_serial_uses_same_layout(self, cli_runner, tmp_path):
+        """Test the default single job writes each profile into the same subfolders as --jobs."""
+        from ios_media_toolkit.encoder import PipelineResult
+
+        video = tmp_path / "clip.MOV"
+        video.write_bytes(b"x" * 1000)
+        out_dirs = []
+
+        def fake_run_pipeline(input_path, output_dir, config):
+            out_dirs.append(output_dir)
+            return PipelineResult(
+                success=True, input_path=input_path, output_path=output_dir / "clip.mp4", pipeline_name=config.name
+            )
+
+        with patch("ios_media_toolkit.encoder.run_pipeline", side_effect=fake_run_pipeline):
+            result = cli_runner.invoke(
+                app, ["compare", str(video), "-o", str(tmp_path / "cmp"), "-p", "archival", "-p", "compact"]
+            )
+
+        assert result.exit_code == 0
+        assert out_dirs == [tmp_path / "cmp" / "archival", tmp_path / "cmp" / "compact"]
+
+
 class TestVerifyCommand:
     """Tests for verify command."""
 
@@ -87,6 +314,31 @@ class TestVerifyCommand:
         assert result.exit_code == 2
 
 
+class TestDngInfoCommand:
+    """Tests for dng info command."""
+
+    def test_batch_lists_each_dng(self, cli_runner, tmp_path):
+        """Test --batch prints one row per DNG in the folder and ignores other files."""
+        from tests.conftest import minimal_tiff_header
+
+        (tmp_path / "a.DNG").write_bytes(minimal_tiff_header(compression=52546))
+        (tmp_path / "b.dng").write_bytes(minimal_tiff_header(compression=7))
+        (tmp_path / "c.heic").write_bytes(b"photo")
+
+        result = cli_runner.invoke(app, ["dng", "info", "--batch", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert re.search(r"a\.DNG.*JXL", result.output)
+        assert re.search(r"b\.dng.*LJPEG", result.output)
+        assert "c.heic" not in result.output
+
+    def test_folder_without_batch_fails(self, cli_runner, tmp_path):
+        """Test a folder argument without --batch is rejected."""
+        result = cli_runner.invoke(app, ["dng", "info", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "--batch" in result.output
+
+
 class TestSetupCommand:
     """Tests for setup command."""
 
@@ -96,3 +348,127 @@ class TestSetupCommand:
         assert result.exit_code == 0
         assert "Auto-install" in result.output
         assert "--force" in result.output
+
+
+class TestLoadYamlConfig:
+    """Tests for cached YAML config loading."""
+
+    def test_repeat_loads_share_parse(self, tmp_path):
+        """Test unchanged config is parsed once and returned read-only."""
+        cfg = tmp_path / "global.yaml"
+        cfg.write_text("video:\n  default_profile: balanced\n")
+
+        first = _load_yaml_config(cfg)
+        assert first is _load_yaml_config(cfg)
+        assert first["video"]["default_profile"] == "balanced"
+        with pytest.raises(TypeError):
+            first["video"] = {}
+
+    def test_edited_config_is_reparsed(self, tmp_path):
+        """Test a changed mtime invalidates the cached parse."""
+        import os
+
+        cfg = tmp_path / "global.yaml"
+        cfg.write_text("a: 1\n")
+        assert _load_yaml_config(cfg)["a"] == 1
+
+        cfg.write_text("a: 2\n")
+        st = cfg.stat()
+        os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert _load_yaml_config(cfg)["a"] == 2
+
+    def test_missing_config_is_empty(self, tmp_path):
+        """Test a missing config file yields an empty mapping."""
+        assert dict(_load_yaml_config(tmp_path / "missing.yaml")) == {}
+
+    def test_missing_default_config_skips_parse(self, tmp_path):
+        """Test no config and no default global.yaml never reaches the parser."""
+        with (
+            patch("ios_media_toolkit.cli._DEFAULT_CFG", tmp_path / "global.yaml"),
+            patch("ios_media_toolkit.cli._parse_yaml_config") as parse,
+        ):
+            assert dict(_load_yaml_config()) == {}
+        parse.assert_not_called()
+
+    def test_parsed_config_reused_across_processes(self, tmp_path):
+        """Test the parsed config is cached outside the config dir and used instead of the YAML."""
+        import json
+
+        from ios_media_toolkit.config import _yaml_cache_file
+
+        cfg = tmp_path / "global.yaml"
+        cfg.write_text("video:\n  default_profile: balanced\n")
+        _load_yaml_config(cfg)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["global.yaml"]
+        cache_file = _yaml_cache_file(cfg)
+        cached = json.loads(cache_file.read_text())
+        st = cfg.stat()
+        assert (cached["mtime_ns"], cached["size"]) == (st.st_mtime_ns, st.st_size)
+        assert cached["data"] == {"video": {"default_profile": "balanced"}}
+
+        # A fresh process (empty in-memory cache) reads the cache file
+        _parse_yaml_config.cache_clear()
+        cached["data"]["video"]["default_profile"] = "from_cache"
+        cache_file.write_text(json.dumps(cached))
+        assert _load_yaml_config(cfg)["video"]["default_profile"] == "from_cache"
+
+
+class TestFormatSizeChange:
+    """Tests for compression ratio formatting."""
+
+    def test_smaller(self):
+        """Test positive ratios read as smaller."""
+        assert format_size_change(0.25) == "[green]25% smaller[/green]"
+
+    def test_larger(self):
+        """Test negative ratios read as larger."""
+        assert format_size_change(-0.1) == "[yellow]10% larger[/yellow]"
+
+    def test_same_size(self):
+        """Test a zero ratio reads as same size."""
+        assert format_size_change(0.0) == "same size"
+
+
+class TestLoadConfigProfiles:
+    """Tests for per-config-file profile caching."""
+
+    @staticmethod
+    def _loader(calls):
+        def loader(cfg):
+            calls.append(cfg)
+            return {"name": cfg.get("name")}
+
+        return loader
+
+    def test_unchanged_file_reuses_profiles(self, tmp_path):
+        """Test profiles are built once while the config file is unchanged."""
+        calls = []
+        loader = self._loader(calls)
+        cfg = tmp_path / "global.yaml"
+        cfg.write_text("name: a\n")
+
+        first = _load_config_profiles(cfg, loader)
+        assert _load_config_profiles(cfg, loader) is first
+        assert first["name"] == "a"
+        assert len(calls) == 1
+
+    def test_edited_file_rebuilds_profiles(self, tmp_path):
+        """Test an edited config file gets fresh profiles."""
+        import os
+
+        loader = self._loader([])
+        cfg = tmp_path / "global.yaml"
+        cfg.write_text("name: a\n")
+        assert _load_config_profiles(cfg, loader)["name"] == "a"
+
+        cfg.write_text("name: b\n")
+        st = cfg.stat()
+        os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert _load_config_profiles(cfg, loader)["name"] == "b"
+
+    def test_missing_file_builds_from_empty_config(self, tmp_path):
+        """Test a missing config file builds profiles from an empty config."""
+        calls = []
+        assert _load_config_profiles(tmp_path / "missing.yaml", self._loader(calls))["name"] is None
+        assert dict(calls[0]) == {}
@@ -4,7 +4,9 @@ from pathlib import Path
 
 from ios_media_toolkit.config import (
     AppConfig,
+    _yaml_cache_file,
     load_config,
+    load_yaml_data,
 )
 
 
@@ -64,6 +66,14 @@ transcode:
         assert config.transcode.enabled is True
         assert config.favorites.rating_threshold == 5
 
+    def test_from_dict_ignores_unknown_keys(self):
+        """Test keys that are not fields of a section are skipped."""
+        config = AppConfig._from_dict({"transcode": {"bitrate": "9M", "bogus": 1, "__class__": "x"}, "extra": {}})
+
+        assert config.transcode.bitrate == "9M"
+        assert not hasattr(config.transcode, "bogus")
+        assert type(config.transcode).__name__ == "TranscodeConfig"
+
     def test_merge_album_config(self, tmp_path):
         """Test merging album-specific overrides."""
         # Create base config
@@ -90,6 +100,41 @@ transcode:
         assert merged.transcode.bitrate == "10M"
         assert merged.transcode.preset == "veryslow"  # Preserved from base
 
+    def test_merge_keeps_base_values_of_overridden_section(self, tmp_path):
+        """Test fields not named in an override keep the base config's (non-default) values."""
+        base_config = tmp_path / "global.yaml"
+        base_config.write_text('transcode:\n  bitrate: "7M"\n  preset: "slow"\npaths:\n  logs_dir: /var/log/imt\n')
+        album_config = tmp_path / "album.yaml"
+        album_config.write_text('transcode:\n  bitrate: "10M"\n')
+
+        config = AppConfig.from_yaml(base_config)
+        merged = config.merge_album_config(album_config)
+
+        assert merged.transcode.bitrate == "10M"
+        assert merged.transcode.preset == "slow"
+        assert merged.paths.logs_dir == Path("/var/log/imt")
+        # The base config is left untouched
+        assert config.transcode.bitrate == "7M"
+
+    def test_merge_missing_album_config(self, tmp_path):
+        """Test a missing album override file returns the config unchanged."""
+        config = AppConfig()
+        assert config.merge_album_config(tmp_path / "missing.yaml") is config
+
+    def test_merge_copies_sections_without_rebuilding_paths(self, tmp_path):
+        """Test merging copies each section but reuses the base's Path objects."""
+        base_config = tmp_path / "global.yaml"
+        base_config.write_text("paths:\n  logs_dir: /var/log/imt\n")
+        album_config = tmp_path / "album.yaml"
+        album_config.write_text('transcode:\n  bitrate: "10M"\n')
+
+        config = AppConfig.from_yaml(base_config)
+        merged = config.merge_album_config(album_config)
+
+        assert merged.paths is not config.paths
+        assert merged.transcode is not config.transcode
+        assert merged.paths.logs_dir is config.paths.logs_dir
+
     def test_to_dict(self):
         """Test converting config to dictionary."""
         config = AppConfig()
@@ -102,6 +147,61 @@ transcode:
         assert "source_base" in data["paths"]
 
 
+class TestLoadYamlData:
+    """Tests for YAML parsing with the parsed-YAML cache."""
+
+    def test_cache_used_while_yaml_unchanged(self, tmp_path):
+        """Test a current cache entry is read instead of the YAML."""
+        import json
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text('transcode:\n  bitrate: "7M"\n')
+        assert AppConfig.from_yaml(config_file).transcode.bitrate == "7M"
+
+        cache_file = _yaml_cache_file(config_file)
+        cached = json.loads(cache_file.read_text())
+        cached["data"]["transcode"]["bitrate"] = "from_cache"
+        cache_file.write_text(json.dumps(cached))
+
+        assert AppConfig.from_yaml(config_file).transcode.bitrate == "from_cache"
+
+    def test_edited_yaml_is_reparsed(self, tmp_path):
+        """Test a newer YAML mtime ignores the stale cache entry."""
+        import os
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("a: 1\n")
+        assert load_yaml_data(config_file) == {"a": 1}
+
+        config_file.write_text("a: 2\n")
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert load_yaml_data(config_file) == {"a": 2}
+
+    def test_size_change_with_same_mtime_is_reparsed(self, tmp_path):
+        """Test a size change invalidates the cache even when the mtime is restored."""
+        import os
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("a: 1\n")
+        st = config_file.stat()
+        assert load_yaml_data(config_file) == {"a": 1}
+
+        config_file.write_text("a: 22\n")
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert load_yaml_data(config_file) == {"a": 22}
+
+    def test_cache_kept_out_of_config_dir(self, tmp_path):
+        """Test parsing writes nothing next to the YAML file."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("a: 1\n")
+
+        load_yaml_data(config_file)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["config.yaml"]
+        assert _yaml_cache_file(config_file).is_file()
+
+
 class TestLoadConfig:
     """Tests for load_config function."""
 
@@ -2,7 +2,7 @@
 
 import struct
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -20,17 +20,48 @@ from ios_media_toolkit.dng.profiles import (
     LjpegFallback,
     get_default_profile_name,
 )
+from tests.conftest import build_tiff, minimal_tiff_header
 
 
 class TestDngCompression:
     """Tests for DngCompression enum."""
 
     def test_compression_values(self):
-        """Test compression type values."""
-        assert DngCompression.JXL.value == "jxl"
-        assert DngCompression.LJPEG.value == "ljpeg"
-        assert DngCompression.UNCOMPRESSED.value == "uncompressed"
-        assert DngCompression.UNKNOWN.value == "unknown"
+        """Test compression members carry the TIFF Compression tag values."""
+        assert DngCompression.JXL == 52546
+        assert DngCompression.LJPEG == 7
+        assert DngCompression.UNCOMPRESSED == 1
+        assert DngCompression.UNKNOWN == 0
+
+    def test_lookup_by_tag_value(self):
+        """Test a raw tag value maps straight to its member."""
+        assert DngCompression(52546) is DngCompression.JXL
+        assert DngCompression(7).name == "LJPEG"
+
+
+class TestLazyImports:
+    """Tests for on-demand loading of dng submodules."""
+
+    def test_package_import_loads_only_used_submodules(self):
+        """Test importing the package (and one name) leaves other submodules unloaded."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from ios_media_toolkit.dng import detect_dng\n"
+            "print(sorted(m for m in sys.modules if m.startswith('ios_media_toolkit.dng.')))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "['ios_media_toolkit.dng.detector']"
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Test names outside the export table still raise AttributeError."""
+        import ios_media_toolkit.dng as dng
+
+        with pytest.raises(AttributeError):
+            _ = dng.not_a_real_name
 
 
 class TestDngInfo:
@@ -83,15 +114,10 @@ class TestDetectDng:
         """Test detecting JXL-compressed DNG."""
         # Create minimal TIFF/DNG header with JXL compression
         dng_file = tmp_path / "test_jxl.dng"
-        header = self._create_minimal_tiff_header(compression=52546)
+        header = minimal_tiff_header(compression=52546)
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10 10 10\n1000000\n4032\n3024",
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.compression == DngCompression.JXL
         assert info.compression_value == 52546
@@ -100,15 +126,10 @@ class TestDetectDng:
     def test_detect_ljpeg_dng(self, tmp_path):
         """Test detecting LJPEG-compressed DNG."""
         dng_file = tmp_path / "test_ljpeg.dng"
-        header = self._create_minimal_tiff_header(compression=7)
+        header = minimal_tiff_header(compression=7)
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10 10 10\n1000000\n4032\n3024",
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.compression == DngCompression.LJPEG
         assert info.compression_value == 7
@@ -117,15 +138,10 @@ class TestDetectDng:
     def test_detect_uncompressed_dng(self, tmp_path):
         """Test detecting uncompressed DNG."""
         dng_file = tmp_path / "test_uncompressed.dng"
-        header = self._create_minimal_tiff_header(compression=1)
+        header = minimal_tiff_header(compression=1)
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10\n0\n0\n0",
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.compression == DngCompression.UNCOMPRESSED
         assert info.compression_value == 1
@@ -134,15 +150,10 @@ class TestDetectDng:
         """Test detecting DNG with unknown compression."""
         dng_file = tmp_path / "test_unknown.dng"
         # Use 999 which is valid for 16-bit but not a known compression type
-        header = self._create_minimal_tiff_header(compression=999)
+        header = minimal_tiff_header(compression=999)
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10\n0\n0\n0",
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.compression == DngCompression.UNKNOWN
         assert info.compression_value == 999
@@ -150,90 +161,173 @@ class TestDetectDng:
     def test_detect_big_endian_tiff(self, tmp_path):
         """Test detecting DNG with big-endian byte order."""
         dng_file = tmp_path / "test_be.dng"
-        header = self._create_minimal_tiff_header(compression=7, big_endian=True)
+        header = minimal_tiff_header(compression=7, big_endian=True, width=4032, height=3024)
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10\n0\n0\n0",
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.compression == DngCompression.LJPEG
+        assert info.dimensions == (4032, 3024)
 
     def test_detect_invalid_tiff(self, tmp_path):
         """Test detecting invalid TIFF returns unknown compression."""
         dng_file = tmp_path / "test_invalid.dng"
         dng_file.write_bytes(b"NOT A TIFF FILE")
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="0\n0\n0\n0\n0\n0",
-            )
+        info = detect_dng(dng_file)
+
+        assert info.compression == DngCompression.UNKNOWN
+        assert info.compression_value == 0
+        assert info.dimensions == (0, 0)
+
+    def test_detect_non_tiff_is_not_mapped(self, tmp_path):
+        """Test a JPEG with a .DNG name is rejected from its header without mapping the file."""
+        dng_file = tmp_path / "really_a_jpeg.DNG"
+        dng_file.write_bytes(b"\xff\xd8\xff\xe0" + b"\0" * 4096)
+
+        with patch("ios_media_toolkit.dng.detector.mmap.mmap") as mock_mmap:
             info = detect_dng(dng_file)
 
+        mock_mmap.assert_not_called()
+        assert info.compression == DngCompression.UNKNOWN
+
+    def test_detect_empty_file(self, tmp_path):
+        """Test an empty file (which cannot be mapped) reads as unknown compression."""
+        dng_file = tmp_path / "empty.dng"
+        dng_file.touch()
+
+        info = detect_dng(dng_file)
+
         assert info.compression == DngCompression.UNKNOWN
         assert info.compression_value == 0
 
-    def test_detect_with_empty_exiftool_output(self, tmp_path):
-        """Test handling empty exiftool output."""
+    def test_detect_missing_tags(self, tmp_path):
+        """Test missing size/bits tags and no preview read as zeros."""
         dng_file = tmp_path / "test.dng"
-        header = self._create_minimal_tiff_header(compression=7)
-        dng_file.write_bytes(header)
+        dng_file.write_bytes(minimal_tiff_header(compression=7))
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="",  # Empty output
-            )
-            info = detect_dng(dng_file)
+        info = detect_dng(dng_file)
 
         assert info.dimensions == (0, 0)
+        assert info.bits_per_sample == 0
         assert info.has_preview is False
+        assert info.preview_dimensions is None
+
+    def test_detect_main_image_and_preview_from_subifds(self, tmp_path):
+        """Test dimensions come from the full-res SubIFD and the preview from the JPEG one."""
+        dng_file = tmp_path / "proraw.dng"
+        # IFD0: small uncompressed thumbnail, as in ProRAW files
+        ifd0 = [(254, 4, [1]), (256, 3, [256]), (257, 3, [192]), (258, 3, [8, 8, 8]), (259, 3, [1])]
+        raw = [(254, 4, [0]), (256, 4, [4032]), (257, 4, [3024]), (258, 3, [10, 10, 10]), (259, 3, [52546])]
+        preview = [(254, 4, [1]), (256, 3, [4032]), (257, 3, [3024]), (259, 3, [7]), (279, 4, [600000, 400000])]
+        dng_file.write_bytes(build_tiff(ifd0, [raw, preview]))
+
+        info = detect_dng(dng_file)
+
+        assert info.compression == DngCompression.JXL
+        assert info.dimensions == (4032, 3024)
+        assert info.bits_per_sample == 10
+        assert info.has_preview is True
+        assert info.preview_size == 1000000
+        assert info.preview_dimensions == (4032, 3024)
+
+    def test_detect_truncated_ifd(self, tmp_path):
+        """Test an IFD whose entry count runs past EOF still yields the entries present."""
+        header = bytearray(minimal_tiff_header(compression=52546))
+        header[8:10] = struct.pack("<H", 5)  # claim 5 entries, only 1 follows
+        dng_file = tmp_path / "truncated.dng"
+        dng_file.write_bytes(bytes(header[:-4]))  # and drop the next-IFD offset
+
+        info = detect_dng(dng_file)
+
+        assert info.compression == DngCompression.JXL
 
-    def test_detect_with_partial_exiftool_output(self, tmp_path):
-        """Test handling partial exiftool output."""
+    def test_detect_does_not_run_exiftool(self, tmp_path):
+        """Test detection reads the file itself instead of spawning exiftool."""
         dng_file = tmp_path / "test.dng"
-        header = self._create_minimal_tiff_header(compression=7)
-        dng_file.write_bytes(header)
+        dng_file.write_bytes(minimal_tiff_header(compression=52546))
 
         with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024",  # Missing fields
-            )
+            detect_dng(dng_file)
+
+        mock_run.assert_not_called()
+
+
+class TestDetectDngCache:
+    """Tests for the detect_dng cache."""
+
+    def _detect(self, dng_file):
+        """Run detect_dng and return (info, number of IFD parses)."""
+        from ios_media_toolkit.dng import detector
+
+        with patch.object(detector, "_parse_dng_ifds", wraps=detector._parse_dng_ifds) as parse:
             info = detect_dng(dng_file)
+        return info, parse.call_count
+
+    def test_unchanged_file_is_not_reparsed(self, tmp_path):
+        """Test a second call is served from the cache."""
+        dng_file = tmp_path / "cached.dng"
+        dng_file.write_bytes(minimal_tiff_header(compression=52546, width=4032, height=3024))
+
+        first, calls = self._detect(dng_file)
+        assert calls == 1
+
+        second, calls = self._detect(dng_file)
+        assert calls == 0
+        assert second == first
+        assert second.compression == DngCompression.JXL
+        assert second.dimensions == (4032, 3024)
+
+    def test_same_file_via_symlink_is_parsed_once(self, tmp_path):
+        """Test a second spelling of the same file reuses the in-process parse."""
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(minimal_tiff_header(compression=52546))
+        link = tmp_path / "link.DNG"
+        link.symlink_to(dng_file)
+
+        assert self._detect(dng_file)[1] == 1
+        info, calls = self._detect(link)
+        assert calls == 0
+        assert info.path == link
+        assert info.compression == DngCompression.JXL
 
-        assert info.dimensions == (4032, 3024)
-        assert info.bits_per_sample == 0
-        assert info.has_preview is False
+    def test_modified_file_is_redetected(self, tmp_path):
+        """Test a size/mtime change invalidates the cached entry."""
+        dng_file = tmp_path / "changed.dng"
+        dng_file.write_bytes(minimal_tiff_header(compression=7))
+        assert self._detect(dng_file)[0].compression == DngCompression.LJPEG
+
+        dng_file.write_bytes(minimal_tiff_header(compression=52546) + b"\0")
+        info, calls = self._detect(dng_file)
+        assert calls == 1
+        assert info.compression == DngCompression.JXL
 
-    @staticmethod
-    def _create_minimal_tiff_header(compression: int = 7, big_endian: bool = False) -> bytes:
-        """Create a minimal valid TIFF header with compression tag."""
-        e = ">" if big_endian else "<"
-        header = bytearray()
-        header.extend(b"MM" if big_endian else b"II")  # Byte order
-        header.extend(struct.pack(f"{e}H", 42))  # TIFF magic
-        header.extend(struct.pack(f"{e}I", 8))  # IFD0 offset
 
-        # IFD0 at offset 8
-        num_entries = 1
-        header.extend(struct.pack(f"{e}H", num_entries))
+class TestDetectDngMany:
+    """Tests for batch DNG detection."""
 
-        # Compression tag (259)
-        header.extend(struct.pack(f"{e}H", 259))  # Tag
-        header.extend(struct.pack(f"{e}H", 3))  # Type: SHORT
-        header.extend(struct.pack(f"{e}I", 1))  # Count
-        header.extend(struct.pack(f"{e}H", compression))  # Value
-        header.extend(struct.pack(f"{e}H", 0))  # Padding
+    def test_results_in_input_order(self, tmp_path):
+        """Test results follow the input order and repeat calls match."""
+        from ios_media_toolkit.dng import detect_dng_many
 
-        # Next IFD offset
-        header.extend(struct.pack(f"{e}I", 0))
+        paths = []
+        for i, compression in enumerate([52546, 7, 1, 52546]):
+            path = tmp_path / f"IMG_{i}.DNG"
+            path.write_bytes(minimal_tiff_header(compression=compression))
+            paths.append(path)
 
-        return bytes(header)
+        infos = detect_dng_many(paths)
+
+        assert [info.path for info in infos] == paths
+        assert [info.compression_value for info in infos] == [52546, 7, 1, 52546]
+        assert detect_dng_many(paths) == infos
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test a missing path raises FileNotFoundError."""
+        from ios_media_toolkit.dng import detect_dng_many
+
+        with pytest.raises(FileNotFoundError):
+            detect_dng_many([tmp_path / "missing.dng"])
 
 
 class TestJxlProfile:
@@ -436,18 +530,188 @@ class TestPreviewExtractor:
         from ios_media_toolkit.dng import extract_preview
 
         dng_file = tmp_path / "test.dng"
-        header = TestDetectDng._create_minimal_tiff_header(compression=7)
+        header = minimal_tiff_header(compression=7)
         dng_file.write_bytes(header)
 
+        with pytest.raises(ValueError, match="no embedded preview"):
+            extract_preview(dng_file)
+
+    def test_extract_contiguous_preview_without_exiftool(self, tmp_path):
+        """Test a single-strip preview is copied straight from the DNG."""
+        from ios_media_toolkit.dng import extract_preview
+
+        jpeg = b"\xff\xd8" + b"preview-bytes" + b"\xff\xd9"
+
+        def build(offset: int) -> bytes:
+            raw = [(254, 4, [0]), (256, 4, [4032]), (257, 4, [3024]), (259, 3, [52546])]
+            preview = [(254, 4, [1]), (256, 3, [4032]), (257, 3, [3024]), (259, 3, [7])]
+            preview += [(273, 4, [offset]), (279, 4, [len(jpeg)])]
+            return build_tiff([(259, 3, [1])], [raw, preview])
+
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(build(len(build(0))) + jpeg)
+
         with patch("subprocess.run") as mock_run:
-            # First call: exiftool for detection (no preview)
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10\n0\n0\n0",  # No preview (length=0)
-            )
+            result = extract_preview(dng_file, tmp_path / "out.jpg", copy_metadata=False, fix_orientation=False)
+
+        mock_run.assert_not_called()
+        assert result.success
+        assert (tmp_path / "out.jpg").read_bytes() == jpeg
+        assert result.preview_dimensions == (4032, 3024)
+
+    def test_contiguous_preview_copy_without_sendfile(self, tmp_path, monkeypatch):
+        """Test the preview copy falls back to a plain read where file-to-file sendfile fails."""
+        import os
+
+        from ios_media_toolkit.dng.preview_extractor import _copy_contiguous_preview
+
+        def no_sendfile(*args):
+            raise OSError("sendfile to a non-socket")
+
+        monkeypatch.setattr(os, "sendfile", no_sendfile)
+        jpeg = b"\xff\xd8" + b"preview-bytes" + b"\xff\xd9"
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"\0" * 10 + jpeg + b"tail")
+
+        assert _copy_contiguous_preview(src, 10, len(jpeg), tmp_path / "out.jpg")
+        assert (tmp_path / "out.jpg").read_bytes() == jpeg
+        assert not _copy_contiguous_preview(src, 10, len(jpeg) + 100, tmp_path / "past_eof.jpg")
+        assert not _copy_contiguous_preview(src, 11, len(jpeg), tmp_path / "not_jpeg.jpg")
 
-            with pytest.raises(ValueError, match="no embedded preview"):
-                extract_preview(dng_file)
+    def test_exiftool_preview_written_to_file(self, tmp_path):
+        """Test exiftool's preview output goes straight to the output file, and a failure removes it."""
+        import subprocess
+
+        from ios_media_toolkit.dng.preview_extractor import extract_preview
+
+        dng_file = self._write_exiftool_preview_dngs(tmp_path, ["IMG_0001.DNG"])[0]
+
+        def exiftool_ok(cmd, stdout, stderr):
+            stdout.write(b"\xff\xd8from-exiftool")
+            return subprocess.CompletedProcess(cmd, 0, stderr=b"")
+
+        with patch("subprocess.run", side_effect=exiftool_ok):
+            result = extract_preview(dng_file, tmp_path / "out.jpg", copy_metadata=False, fix_orientation=False)
+
+        assert result.success
+        assert (tmp_path / "out.jpg").read_bytes() == b"\xff\xd8from-exiftool"
+
+        with patch("subprocess.run", return_value=subprocess.CompletedProcess([], 1, stderr=b"no preview")):
+            result = extract_preview(dng_file, tmp_path / "bad.jpg", copy_metadata=False, fix_orientation=False)
+
+        assert not result.success
+        assert result.error_message == "Failed to extract preview: no preview"
+        assert not (tmp_path / "bad.jpg").exists()
+
+    def test_extract_preview_reuses_given_info(self, tmp_path):
+        """Test a caller-supplied DngInfo is used without detecting the file again."""
+        from ios_media_toolkit.dng import DngCompression, DngInfo, extract_preview
+
+        jpeg = b"\xff\xd8" + b"preview-bytes" + b"\xff\xd9"
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(b"\0" * 64 + jpeg)
+        info = DngInfo(
+            path=dng_file,
+            compression=DngCompression.JXL,
+            compression_value=52546,
+            dimensions=(4032, 3024),
+            bits_per_sample=10,
+            has_preview=True,
+            preview_dimensions=(4032, 3024),
+            preview_size=len(jpeg),
+            file_size=64 + len(jpeg),
+            preview_offset=64,
+        )
+
+        with patch("ios_media_toolkit.dng.preview_extractor.detect_dng") as mock_detect:
+            result = extract_preview(dng_file, tmp_path / "out.jpg", False, False, info=info)
+
+        mock_detect.assert_not_called()
+        assert (tmp_path / "out.jpg").read_bytes() == jpeg
+        assert result.input_size == 64 + len(jpeg)
+
+    # Stand-in for `exiftool -stay_open True -@ -`: logs each start and command, answers -PreviewImage
+    _FAKE_EXIFTOOL = """
+import os, sys
+log = open(os.environ["FAKE_EXIFTOOL_LOG"], "a")
+log.write("start\\n")
+args = []
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line.startswith("-execute"):
+        log.write(" ".join(args) + "\\n")
+        log.flush()
+        if "-PreviewImage" in args:
+            sys.stdout.buffer.write(b"\\xff\\xd8exif-preview\\xff\\xd9")
+        sys.stdout.buffer.write(b"{ready" + line[8:].encode() + b"}\\n")
+        sys.stdout.flush()
+        args = []
+    elif args[-1:] == ["-stay_open"] and line == "False":
+        break
+    else:
+        args.append(line)
+"""
+
+    @classmethod
+    def _install_fake_exiftool(cls, tmp_path, monkeypatch) -> Path:
+        """Put a fake stay-open exiftool first on PATH; returns its log file."""
+        import os
+        import sys
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        tool = bin_dir / "exiftool"
+        tool.write_text(f"#!{sys.executable}{cls._FAKE_EXIFTOOL}")
+        tool.chmod(0o755)
+        log = tmp_path / "exiftool.log"
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("FAKE_EXIFTOOL_LOG", str(log))
+        return log
+
+    @staticmethod
+    def _write_exiftool_preview_dngs(tmp_path, names) -> list[Path]:
+        """Write DNGs whose preview strip isn't a bare JPEG, so the preview itself comes from exiftool."""
+        raw = [(254, 4, [0]), (256, 4, [4032]), (257, 4, [3024]), (259, 3, [52546])]
+        preview = [(254, 4, [1]), (256, 3, [1008]), (257, 3, [756]), (259, 3, [7]), (273, 4, [8]), (279, 4, [64])]
+        inputs = []
+        for name in names:
+            dng_file = tmp_path / name
+            dng_file.write_bytes(build_tiff([(259, 3, [1])], [raw, preview]))
+            inputs.append(dng_file)
+        return inputs
+
+    def test_batch_runs_exiftool_once_per_worker(self, tmp_path, monkeypatch):
+        """Test a batch sends every file's exiftool commands to one persistent process per worker."""
+        from ios_media_toolkit.dng import preview_extractor
+
+        monkeypatch.setattr(preview_extractor, "PREVIEW_WORKERS", 1)
+        log = self._install_fake_exiftool(tmp_path, monkeypatch)
+        inputs = self._write_exiftool_preview_dngs(tmp_path, ["IMG_0001.DNG", "IMG_0002.DNG"])
+
+        results = preview_extractor.batch_extract_previews(inputs, output_dir=tmp_path / "out")
+
+        assert [r.success for r in results] == [True, True]
+        assert (tmp_path / "out" / "IMG_0002.jpg").read_bytes() == b"\xff\xd8exif-preview\xff\xd9"
+        lines = log.read_text().splitlines()
+        assert lines.count("start") == 1
+        assert len(lines) == 1 + 2 * 2  # preview, then orientation + metadata copy per file
+        assert lines[1] == f"-b -PreviewImage {inputs[0]}"
+        out = tmp_path / "out" / "IMG_0001.jpg"
+        # The copy follows the orientation reset, so the DNG's Orientation wins as before
+        assert lines[2] == f"-overwrite_original -Orientation#=1 -TagsFromFile {inputs[0]} -all:all {out}"
+
+    def test_batch_keeps_input_order(self, tmp_path, monkeypatch):
+        """Test parallel batch results line up with the inputs, failures included."""
+        from ios_media_toolkit.dng.preview_extractor import batch_extract_previews
+
+        self._install_fake_exiftool(tmp_path, monkeypatch)
+        inputs = self._write_exiftool_preview_dngs(tmp_path, [f"IMG_{n:04d}.DNG" for n in range(8)])
+        inputs.insert(3, tmp_path / "missing.DNG")
+
+        results = batch_extract_previews(inputs, output_dir=tmp_path / "out")
+
+        assert [r.input_path for r in results] == inputs
+        assert [r.success for r in results] == [True] * 3 + [False] + [True] * 5
 
 
 class TestJxlCompressor:
@@ -465,14 +729,274 @@ class TestJxlCompressor:
         from ios_media_toolkit.dng import compress_jxl_dng
 
         dng_file = tmp_path / "test.dng"
-        header = TestDetectDng._create_minimal_tiff_header(compression=7)  # LJPEG
+        header = minimal_tiff_header(compression=7)  # LJPEG
         dng_file.write_bytes(header)
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0,
-                stdout="4032\n3024\n10\n1000000\n4032\n3024",
-            )
+        with pytest.raises(ValueError, match="not JXL-compressed"):
+            compress_jxl_dng(dng_file)
+
+    # Stand-ins for djxl/cjxl: djxl wraps the tile in a 16-bit PPM, cjxl unwraps it with a "re:" prefix
+    _FAKE_DJXL = """
+import sys
+src, dst = sys.argv[1], sys.argv[2]
+data = sys.stdin.buffer.read() if src == "-" else open(src, "rb").read()
+if data.startswith(b"BAD"):
+    sys.exit("corrupt tile")
+ppm = b"P6\\n%d 1\\n65535\\n" % (len(data) // 6) + data
+sys.stdout.buffer.write(ppm) if dst == "-" else open(dst, "wb").write(ppm)
+"""
+    _FAKE_CJXL = """
+import sys
+src, dst = sys.argv[1], sys.argv[2]
+data = sys.stdin.buffer.read() if src == "-" else open(src, "rb").read()
+out = b"re:" + data.split(b"\\n", 3)[3]
+if out.startswith(b"re:FAIL"):
+    sys.exit("encode failed")
+sys.stdout.buffer.write(out) if dst == "-" else open(dst, "wb").write(out)
+"""
+
+    @classmethod
+    def _install_fake_jxl_tools(cls, tmp_path, monkeypatch) -> None:
+        """Put fake djxl/cjxl executables first on PATH."""
+        import os
+        import sys
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        for name, body in (("djxl", cls._FAKE_DJXL), ("cjxl", cls._FAKE_CJXL)):
+            tool = bin_dir / name
+            tool.write_text(f"#!{sys.executable}{body}")
+            tool.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    @staticmethod
+    def _build_tiled_jxl_dng(tiles: list[bytes], filler: bytes = b"") -> bytes:
+        """Build a DNG whose raw SubIFD is JXL-tiled with filler and then the tile payloads appended."""
+
+        def build(first: int) -> bytes:
+            offsets = [first + sum(map(len, tiles[:i])) for i in range(len(tiles))]
+            raw = [(254, 4, [0]), (256, 4, [512]), (257, 4, [512]), (259, 3, [52546])]
+            raw += [(324, 4, offsets), (325, 4, [len(t) for t in tiles])]
+            return build_tiff([(259, 3, [1])], [raw])
+
+        return build(len(build(0)) + len(filler)) + filler + b"".join(tiles)
+
+    @staticmethod
+    def _read_tiles(data: bytes) -> list[bytes]:
+        """Return the tile payloads of the tiled IFD in a DNG built by _build_tiled_jxl_dng."""
+        from ios_media_toolkit.dng.jxl_compressor import (
+            TAG_TILE_BYTECOUNTS,
+            TAG_TILE_OFFSETS,
+            _choose_main_tiled_ifd,
+            _iter_ifds,
+            _read_values,
+        )
+
+        main = _choose_main_tiled_ifd("<", data, list(_iter_ifds("<", data, 8)))
+        offsets = _read_values("<", data, main.entries[TAG_TILE_OFFSETS])
+        counts = _read_values("<", data, main.entries[TAG_TILE_BYTECOUNTS])
+        return [data[o : o + c] for o, c in zip(offsets, counts, strict=True)]
+
+    def test_compress_transcodes_every_tile_in_order(self, tmp_path, monkeypatch):
+        """Test tiles are re-encoded concurrently but written back in their original order."""
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        tiles = [bytes([n]) * 6 * (n + 1) for n in range(6)]
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(self._build_tiled_jxl_dng(tiles))
+        progress = []
+
+        result = compress_jxl_dng(dng_file, tmp_path / "out.DNG", progress_callback=lambda *p: progress.append(p))
+
+        assert result.success
+        assert result.tiles_processed == 6
+        assert self._read_tiles((tmp_path / "out.DNG").read_bytes()) == [b"re:" + t for t in tiles]
+        assert result.tile_stats == [(len(t), len(t) + 3) for t in tiles]
+        assert progress == [(done, 6) for done in range(1, 7)]
+        assert result.output_size == (tmp_path / "out.DNG").stat().st_size
+
+    def test_compress_keeps_data_before_first_tile(self, tmp_path, monkeypatch):
+        """Test data between the IFDs and the first tile (e.g. a preview) is carried over unchanged."""
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        filler = b"PREVIEW-JPEG" * 100
+        orig = self._build_tiled_jxl_dng([b"\1" * 6, b"\2" * 12], filler=filler)
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(orig)
+
+        compress_jxl_dng(dng_file, tmp_path / "out.DNG")
+
+        out = (tmp_path / "out.DNG").read_bytes()
+        first_tile = len(orig) - 18
+        assert out[first_tile - len(filler) : first_tile] == filler
+        assert out[first_tile:] == b"re:" + b"\1" * 6 + b"re:" + b"\2" * 12
+
+    def test_compress_shares_identical_tiles(self, tmp_path, monkeypatch):
+        """Test byte-identical tiles are transcoded once and point at the same stored data."""
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        flat, detail = b"\0" * 12, b"\7" * 6
+        tiles = [flat, detail, flat, flat]
+        orig = self._build_tiled_jxl_dng(tiles)
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(orig)
+        progress = []
+
+        result = compress_jxl_dng(dng_file, tmp_path / "out.DNG", progress_callback=lambda *p: progress.append(p))
+
+        out = (tmp_path / "out.DNG").read_bytes()
+        assert self._read_tiles(out) == [b"re:" + t for t in tiles]
+        assert progress == [(1, 2), (2, 2)]
+        assert len(out) == len(orig) - sum(map(len, tiles)) + len(b"re:" + flat) + len(b"re:" + detail)
+        assert result.tile_stats == [(12, 15), (6, 9), (12, 15), (12, 15)]
+
+    def test_find_main_tiled_ifd_stops_at_full_resolution_ifd(self, monkeypatch):
+        """Test the IFD walk ends at the tiled NewSubFileType-0 IFD without parsing the rest."""
+        from ios_media_toolkit.dng import jxl_compressor
+
+        tiled = [(322, 4, [256]), (323, 4, [256]), (324, 4, [0]), (325, 4, [0])]
+        preview = [(254, 4, [1]), (256, 4, [8000]), (257, 4, [6000]), *tiled]
+        raw = [(254, 4, [0]), (256, 4, [4032]), (257, 4, [3024]), *tiled]
+        # SubIFDs are walked last-first, so the raw IFD is reached before the preview
+        data = build_tiff([(254, 4, [1])], [preview, raw])
+        parsed = []
+        parse_ifd = jxl_compressor._parse_ifd
+        monkeypatch.setattr(jxl_compressor, "_parse_ifd", lambda e, d, off: parsed.append(off) or parse_ifd(e, d, off))
+
+        main = jxl_compressor._find_main_tiled_ifd("<", data, 8)
+
+        assert jxl_compressor._read_values("<", data, main.entries[256]) == (4032,)
+        assert len(parsed) == 2
+
+    def test_find_main_tiled_ifd_falls_back_to_largest(self):
+        """Test without a NewSubFileType-0 tiled IFD the largest tiled IFD is used."""
+        from ios_media_toolkit.dng.jxl_compressor import _find_main_tiled_ifd, _read_values
+
+        tiled = [(324, 4, [0]), (325, 4, [0])]
+        small = [(256, 4, [1024]), (257, 4, [768]), *tiled]
+        large = [(256, 4, [4032]), (257, 4, [3024]), *tiled]
+        data = build_tiff([(259, 3, [1])], [large, small])
+
+        main = _find_main_tiled_ifd("<", data, 8)
+
+        assert _read_values("<", data, main.entries[256]) == (4032,)
+
+    def test_compress_many_tiles(self, tmp_path, monkeypatch):
+        """Test a DNG with more tiles than fit the small-array path is rewritten intact."""
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        tiles = [n.to_bytes(6, "little") for n in range(48)]
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(self._build_tiled_jxl_dng(tiles))
+
+        result = compress_jxl_dng(dng_file, tmp_path / "out.DNG")
+
+        assert result.tiles_processed == 48
+        assert self._read_tiles((tmp_path / "out.DNG").read_bytes()) == [b"re:" + t for t in tiles]
+        assert all(type(old) is int for old, _ in result.tile_stats)
+
+    def test_compress_reports_undecodable_tile(self, tmp_path, monkeypatch):
+        """Test a tile djxl rejects fails the compression without writing output."""
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(self._build_tiled_jxl_dng([b"\0" * 6, b"BAD" * 2]))
+
+        result = compress_jxl_dng(dng_file, tmp_path / "out.DNG")
+
+        assert not result.success
+        assert "Failed to decode tile 1" in result.error_message
+        assert list(tmp_path.glob("out.DNG*")) == []
+
+    def test_ordered_tile_writer_holds_back_early_tiles(self):
+        """Test tiles finishing out of order are written in tile order, duplicates sharing their source."""
+        import io
+
+        import numpy as np
+
+        from ios_media_toolkit.dng.jxl_compressor import _OrderedTileWriter
+
+        out = io.BytesIO(b"HDR")
+        out.seek(3)
+        writer = _OrderedTileWriter(out, np.array([0, 1, 0, 3]))
+
+        writer.add(3, b"dd")
+        writer.add(1, b"bbb")
+        assert out.getvalue() == b"HDR"
+        writer.add(0, b"a")
+
+        assert out.getvalue() == b"HDRabbbdd"
+        assert writer.offsets.tolist() == [3, 4, 3, 7]
+        assert writer.counts.tolist() == [1, 3, 1, 2]
+        assert writer.received == 3
+
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    @pytest.mark.parametrize(
+        ("typ", "vals"),
+        [
+            (3, [1, 65535]),
+            (4, [7, 2**32 - 1, 0]),
+            (9, [-5]),
+            # Long tile arrays go through numpy views
+            (3, list(range(0, 65535, 1000))),
+            (4, [2**32 - 1 - n for n in range(40)]),
+            (9, list(range(-20, 20))),
+        ],
+    )
+    def test_tiff_values_round_trip(self, endian, typ, vals):
+        """Test tile arrays are read and patched in place with the entry's byte order and type."""
+        from ios_media_toolkit.dng.jxl_compressor import _IfdEntry, _read_values, _write_values
+
+        entry = _IfdEntry(tag=324, typ=typ, count=len(vals), value_u32=0, entry_pos=0, value_pos=4)
+        buf = bytearray(8 + 4 * len(vals))
+
+        _write_values(endian, buf, entry, vals)
+
+        assert [int(v) for v in _read_values(endian, bytes(buf), entry)] == vals
+        assert buf[:4] == b"\0" * 4
+
+    def test_tiff_values_reject_unsupported_type(self):
+        """Test value arrays of other TIFF types are refused."""
+        from ios_media_toolkit.dng.jxl_compressor import _IfdEntry, _read_values
+
+        entry = _IfdEntry(tag=324, typ=5, count=1, value_u32=0, entry_pos=0, value_pos=0)
+
+        with pytest.raises(ValueError, match="Unsupported TIFF type 5"):
+            _read_values("<", bytes(16), entry)
+
+    def test_tool_threads_split_cpus_between_tiles(self, monkeypatch):
+        """Test each tool gets a share of the CPUs, and no thread pool once every CPU runs a tile."""
+        from ios_media_toolkit.dng import jxl_compressor
+
+        monkeypatch.setattr(jxl_compressor, "TILE_WORKERS", 8)
+
+        assert jxl_compressor._tool_threads(8) == 0
+        assert jxl_compressor._tool_threads(5) == 0
+        assert jxl_compressor._tool_threads(2) == 4
+        assert jxl_compressor._tool_threads(1) == 8
+
+    def test_cjxl_command_includes_thread_count(self):
+        """Test the cjxl command carries the profile settings and thread count."""
+        from ios_media_toolkit.dng.jxl_compressor import _cjxl_command
+
+        cmd = _cjxl_command("-", "out.jxl", JxlProfile(distance=2.0, effort=5), num_threads=0)
+
+        assert cmd == ["cjxl", "-", "out.jxl", "-d", "2.0", "-e", "5", "-m", "1", "--num_threads", "0"]
+
+    def test_compress_raises_on_encode_failure(self, tmp_path, monkeypatch):
+        """Test a cjxl failure on the piped PPM surfaces as CalledProcessError."""
+        import subprocess
+
+        from ios_media_toolkit.dng import compress_jxl_dng
+
+        self._install_fake_jxl_tools(tmp_path, monkeypatch)
+        dng_file = tmp_path / "IMG_0001.DNG"
+        dng_file.write_bytes(self._build_tiled_jxl_dng([b"FAIL\0\0"]))
 
-            with pytest.raises(ValueError, match="not JXL-compressed"):
-                compress_jxl_dng(dng_file)
+        with pytest.raises(subprocess.CalledProcessError, match="cjxl"):
+            compress_jxl_dng(dng_file, tmp_path / "out.DNG")
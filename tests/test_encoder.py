@@ -1,6 +1,7 @@
 """Tests for encoder module."""
 
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 from ios_media_toolkit.encoder import (
     Encoder,
@@ -11,6 +12,8 @@ from ios_media_toolkit.encoder import (
     build_x265_command,
     get_effective_resolution,
     get_nvenc_preset,
+    get_video_duration,
+    get_video_resolution,
     load_encoder_profile,
 )
 
@@ -93,6 +96,30 @@ class TestResolutionLogic:
         assert get_effective_resolution(3840, "720p") == "720p"
 
 
+class TestProbeHelpers:
+    """Tests for the ffprobe duration/resolution helpers."""
+
+    def test_duration_parsed_from_bytes(self):
+        """Test duration is parsed from raw ffprobe output."""
+        with patch("subprocess.run", return_value=MagicMock(stdout=b"12.345\n")):
+            assert get_video_duration(Path("clip.mov")) == 12.345
+
+    def test_duration_unparseable(self):
+        """Test empty ffprobe output yields zero duration."""
+        with patch("subprocess.run", return_value=MagicMock(stdout=b"")):
+            assert get_video_duration(Path("clip.mov")) == 0.0
+
+    def test_resolution_parsed_from_bytes(self):
+        """Test width and height are parsed from raw ffprobe csv output."""
+        with patch("subprocess.run", return_value=MagicMock(stdout=b"3840,2160\n")):
+            assert get_video_resolution(Path("clip.mov")) == (3840, 2160)
+
+    def test_resolution_unparseable(self):
+        """Test unexpected ffprobe output yields (0, 0)."""
+        with patch("subprocess.run", return_value=MagicMock(stdout=b"N/A\n")):
+            assert get_video_resolution(Path("clip.mov")) == (0, 0)
+
+
 class TestEncoderProfile:
     """Tests for EncoderProfile dataclass."""
 
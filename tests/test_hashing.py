@@ -0,0 +1,49 @@
+"""Tests for hashing module."""
+
+import hashlib
+
+from ios_media_toolkit.hashing import file_hexdigest, sha256_file, sha256_many
+
+
+class TestFileHexdigest:
+    """Tests for whole-file digests."""
+
+    def test_sha256_matches_hashlib(self, tmp_path):
+        """Test sha256_file agrees with hashlib on the same bytes."""
+        data = b"\x00\x01" * 100_000
+        path = tmp_path / "clip.mov"
+        path.write_bytes(data)
+
+        assert sha256_file(path) == hashlib.sha256(data).hexdigest()
+
+    def test_other_algorithm(self, tmp_path):
+        """Test file_hexdigest accepts other hashlib algorithms."""
+        path = tmp_path / "photo.heic"
+        path.write_bytes(b"hello")
+
+        assert file_hexdigest(path, "md5") == hashlib.md5(b"hello").hexdigest()
+
+    def test_empty_file(self, tmp_path):
+        """Test hashing an empty file."""
+        path = tmp_path / "empty"
+        path.write_bytes(b"")
+
+        assert sha256_file(path) == hashlib.sha256(b"").hexdigest()
+
+
+class TestSha256Many:
+    """Tests for concurrent multi-file hashing."""
+
+    def test_results_in_input_order(self, tmp_path):
+        """Test digests come back in the order of the input paths."""
+        paths = []
+        for i in range(10):
+            path = tmp_path / f"file{i}.bin"
+            path.write_bytes(bytes([i]) * 1000)
+            paths.append(path)
+
+        assert sha256_many(paths) == [sha256_file(p) for p in paths]
+
+    def test_empty_input(self):
+        """Test no paths gives no digests."""
+        assert sha256_many([]) == []
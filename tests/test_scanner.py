@@ -76,6 +76,17 @@ class TestMediaFile:
         assert media.size == len(b"fake heic content")
         assert media.is_edited is False
 
+    def test_from_path_reuses_given_stat(self, tmp_path):
+        """Test a caller-supplied stat result is used instead of a fresh stat."""
+        photo = tmp_path / "IMG_0001.HEIC"
+        photo.write_bytes(b"abc")
+        st = photo.stat()
+        photo.write_bytes(b"longer content")
+
+        media = MediaFile.from_path(photo, stat=st)
+
+        assert media.size == 3
+
     def test_from_path_video(self, tmp_path):
         """Test creating MediaFile from video path."""
         video = tmp_path / "IMG_0002.MOV"
@@ -199,6 +199,104 @@ class TestSequentialRunnerScan:
         assert len(workflow.videos_to_copy) == 1
         assert len(workflow.videos_to_transcode) == 0
 
+    def test_scan_min_size_uses_scanned_sizes(self, tmp_path, sample_profile):
+        """Test the min-size check reads sizes recorded by the scan instead of stat()."""
+        from ios_media_toolkit.actions import ScanResult
+
+        source = tmp_path / "source"
+        output = tmp_path / "output"
+        source.mkdir()
+        video = source / "clip.MOV"
+        video.write_bytes(b"x" * 100)
+
+        # Scan reported the file as 2MB; a fresh stat() would route it to copy
+        scan_result = ScanResult(success=True, videos=[video], photos=[], video_sizes=[2 * 1024 * 1024], photo_sizes=[])
+        workflow = create_archive_workflow(source, output, sample_profile, min_size_mb=1, scan_result=scan_result)
+        SequentialRunner(dry_run=True).run(workflow)
+
+        assert workflow.videos_to_transcode == [video]
+        assert workflow.videos_to_copy == []
+
+    def test_scan_separates_dngs_case_insensitively(self, tmp_path, sample_profile):
+        """Test DNGs are split from regular photos whatever the suffix case."""
+        source = tmp_path / "source"
+        source.mkdir()
+        for name in ("a.DNG", "b.dng", "c.Dng", "d.heic"):
+            (source / name).touch()
+
+        workflow = create_archive_workflow(source, tmp_path / "output", sample_profile)
+        SequentialRunner(dry_run=True).run(workflow)
+
+        assert sorted(p.name for p in workflow.dngs_to_process) == ["a.DNG", "b.dng", "c.Dng"]
+        assert [p.name for p in workflow.photos_to_copy] == ["d.heic"]
+
+    def test_scan_skips_videos_with_existing_output(self, tmp_path, sample_profile):
+        """Test videos whose output (plain or favorite-suffixed) exists are skipped unless forced."""
+        from ios_media_toolkit.constants import FAV_SUFFIX
+
+        source = tmp_path / "source"
+        output = tmp_path / "output"
+        source.mkdir()
+        output.mkdir()
+        (source / "a.MOV").write_bytes(b"x" * 1000)
+        (source / "b.MOV").write_bytes(b"x" * 1000)
+        (source / "c.MOV").write_bytes(b"x" * 1000)
+        (output / "a.mp4").touch()
+        (output / f"b{FAV_SUFFIX}.mp4").touch()
+
+        workflow = create_archive_workflow(source, output, sample_profile)
+        SequentialRunner(dry_run=True).run(workflow)
+        assert [v.name for v in workflow.videos_to_transcode] == ["c.MOV"]
+
+        forced = create_archive_workflow(source, output, sample_profile, force=True)
+        SequentialRunner(dry_run=True).run(forced)
+        assert len(forced.videos_to_transcode) == 3
+
+    def test_scan_without_precomputed_results_walks_once(self, tmp_path, sample_profile):
+        """Test the runner's own scan also supplies the classify task's favorites."""
+        source = tmp_path / "source"
+        output = tmp_path / "output"
+        source.mkdir()
+        (source / "photo.heic").touch()
+        (source / "photo.heic.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+
+        workflow = create_archive_workflow(source, output, sample_profile)
+        with patch("ios_media_toolkit.runners.sequential.classify_favorites") as mock_classify:
+            result = SequentialRunner(dry_run=True).run(workflow)
+
+        assert result.success
+        mock_classify.assert_not_called()
+        assert "photo" in workflow.favorites
+
+    def test_scan_reuses_precomputed_results(self, tmp_path, sample_profile):
+        """Test precomputed scan/classify results skip the runner's own pass."""
+        from ios_media_toolkit.actions import scan_and_classify
+
+        source = tmp_path / "source"
+        output = tmp_path / "output"
+        source.mkdir()
+        (source / "video.MOV").write_bytes(b"x" * 1000)
+        (source / "photo.heic").touch()
+        (source / "photo.heic.xmp").write_text("<xmp:Rating>5</xmp:Rating>")
+
+        scan_result, classify_result = scan_and_classify(source)
+        workflow = create_archive_workflow(
+            source, output, sample_profile, scan_result=scan_result, classify_result=classify_result
+        )
+        runner = SequentialRunner(dry_run=True)
+
+        with (
+            patch("ios_media_toolkit.runners.sequential.scan_and_classify") as mock_scan,
+            patch("ios_media_toolkit.runners.sequential.classify_favorites") as mock_classify,
+        ):
+            result = runner.run(workflow)
+
+        assert result.success
+        mock_scan.assert_not_called()
+        mock_classify.assert_not_called()
+        assert len(workflow.videos_to_transcode) == 1
+        assert "photo" in workflow.favorites
+
 
 class TestSequentialRunnerClassify:
     """Tests for classify task execution."""